@@ -1,11 +1,15 @@
 """Deterministic text embedding for semantic memory."""
 
-import hashlib
-import math
-import random
+import zlib
+from functools import lru_cache
 
+import numpy as np
 
-def normalize(vec: list[float]) -> list[float]:
+# Scale mapping unit-vector components in [-1, 1] to int8 in [-127, 127]
+I8_SCALE = 127
+
+
+def normalize(vec: np.ndarray) -> np.ndarray:
     """Normalize a vector to unit length.
     
     Args:
@@ -14,10 +18,49 @@ def normalize(vec: list[float]) -> list[float]:
     Returns:
         Normalized vector with unit length.
     """
-    magnitude = math.sqrt(sum(x * x for x in vec))
+    magnitude = np.linalg.norm(vec)
     if magnitude == 0.0:
         return vec
-    return [x / magnitude for x in vec]
+    return vec / magnitude
+
+
+def quantize_i8(vec: np.ndarray) -> np.ndarray:
+    """Quantize a unit-normalized vector to int8.
+    
+    Components are scaled by I8_SCALE and rounded, so the dot product of two
+    quantized vectors divided by I8_SCALE**2 approximates their cosine.
+    
+    Args:
+        vec: Unit-normalized vector (or matrix of row vectors).
+        
+    Returns:
+        int8 array of the same shape.
+    """
+    scaled = np.rint(np.asarray(vec, dtype=np.float32) * I8_SCALE)
+    return np.clip(scaled, -I8_SCALE, I8_SCALE).astype(np.int8)
+
+
+@lru_cache(maxsize=1024)
+def _embed_cached(dim: int, normalized: str) -> np.ndarray:
+    """Embed already-normalized text; cached, so the result is read-only.
+    
+    Args:
+        dim: Embedding dimension.
+        normalized: Lowercased, stripped text.
+        
+    Returns:
+        Read-only unit-normalized float32 vector of shape (dim,).
+    """
+    # Use stable (non-cryptographic) hash to seed RNG
+    seed = zlib.crc32(normalized.encode('utf-8'))
+    
+    # Generate deterministic vector
+    rng = np.random.default_rng(seed)
+    vec = normalize(rng.standard_normal(dim, dtype=np.float32))
+    
+    # Shared between callers: freeze so no caller can corrupt the cache
+    vec.flags.writeable = False
+    return vec
 
 
 class DeterministicEmbedder:
@@ -34,29 +77,23 @@ class DeterministicEmbedder:
         """
         self.dim = dim
     
-    def embed_text(self, text: str) -> list[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         """Generate deterministic embedding for text.
         
-        Uses MD5 hash of normalized text to seed RNG, then generates
-        a random vector and normalizes it to unit length.
+        Uses a CRC32 hash of normalized text to seed NumPy's PCG64 generator,
+        then draws a standard-normal vector and normalizes it to unit length.
+        Results are memoized per (dim, normalized text) and returned
+        read-only; copy before modifying in place.
         
         Args:
             text: Input text to embed.
             
         Returns:
-            Normalized embedding vector of length self.dim.
+            Normalized float32 embedding vector of shape (self.dim,).
         """
-        # Normalize text
-        normalized = text.lower().strip()
-        
-        # Use stable hash to seed RNG
-        text_hash = hashlib.md5(normalized.encode('utf-8')).hexdigest()
-        seed = int(text_hash[:8], 16)  # Use first 8 hex chars as seed
-        
-        # Generate deterministic vector
-        rng = random.Random(seed)
-        vec = [rng.gauss(0, 1) for _ in range(self.dim)]
-        
-        # Return normalized vector
-        return normalize(vec)
-
+        return _embed_cached(self.dim, text.lower().strip())
+    
+    @staticmethod
+    def cache_clear() -> None:
+        """Drop all memoized embeddings (shared by every embedder)."""
+        _embed_cached.cache_clear()
@@ -1,29 +1,97 @@
 """Semantic retrieval for memory-guided navigation."""
 
-import math
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, Union
 
-from memory.embedding import DeterministicEmbedder
+import numpy as np
+
+from memory.embedding import I8_SCALE, DeterministicEmbedder, quantize_i8
 from memory.store import SemanticMemoryStore
 from memory.utils import tokenize
 
+try:
+    # Optional: JIT-compiled scoring loop
+    from numba import njit
+except ImportError:
+    njit = None
+
 
-def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
+@dataclass
+class QueryContext:
+    """Goal-side retrieval inputs, computed once per goal.
+    
+    Build with QueryContext.make() and pass to retrieve_candidates() in
+    place of goal_text when the same goal is queried repeatedly.
+    
+    Attributes:
+        goal_text: Original goal text.
+        goal_embedding: Unit-normalized goal embedding.
+        goal_tokens: Goal tokens (duplicates kept; len() is the keyword
+            score denominator).
+    """
+    goal_text: str
+    goal_embedding: np.ndarray
+    goal_tokens: tuple[str, ...]
+    # Goal token mask for the store it was last computed against; stale
+    # once that store's vocabulary grows.
+    _mask_key: Optional[tuple[int, int]] = field(default=None, repr=False)
+    _mask: int = field(default=0, repr=False)
+    
+    @classmethod
+    def make(cls, embedder: DeterministicEmbedder, goal_text: str) -> "QueryContext":
+        """Tokenize and embed goal_text.
+        
+        Args:
+            embedder: Text embedder for the goal.
+            goal_text: Natural language goal description.
+            
+        Returns:
+            QueryContext for goal_text.
+        """
+        return cls(
+            goal_text=goal_text,
+            goal_embedding=embedder.embed_text(goal_text),
+            goal_tokens=tokenize(goal_text)
+        )
+    
+    def goal_mask(self, store: SemanticMemoryStore) -> int:
+        """Get the goal token bitmask over store's vocabulary.
+        
+        Args:
+            store: Store whose token vocabulary defines the bits.
+            
+        Returns:
+            Goal token mask (cached until the store vocabulary grows).
+        """
+        key = (store.uid, store.vocab_size)
+        if self._mask_key != key:
+            self._mask = store.token_mask(self.goal_tokens)
+            self._mask_key = key
+        return self._mask
+
+
+def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     """Compute cosine similarity between two vectors.
     
+    General-purpose version that normalizes both inputs. Retrieval scores
+    unit-normalized embeddings as plain dot products instead (see
+    _cosine_batch_unit()).
+    
     Args:
-        vec1: First vector.
-        vec2: Second vector.
+        vec1: First vector (array-like).
+        vec2: Second vector (array-like).
         
     Returns:
         Cosine similarity in range [-1, 1].
     """
-    if len(vec1) != len(vec2):
+    vec1 = np.asarray(vec1, dtype=np.float32)
+    vec2 = np.asarray(vec2, dtype=np.float32)
+    if vec1.shape != vec2.shape:
         return 0.0
     
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = math.sqrt(sum(a * a for a in vec1))
-    magnitude2 = math.sqrt(sum(b * b for b in vec2))
+    dot_product = float(np.dot(vec1, vec2))
+    magnitude1 = float(np.linalg.norm(vec1))
+    magnitude2 = float(np.linalg.norm(vec2))
     
     if magnitude1 == 0.0 or magnitude2 == 0.0:
         return 0.0
@@ -31,11 +99,44 @@ def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
     return dot_product / (magnitude1 * magnitude2)
 
 
+def _cosine_batch_unit(matrix: np.ndarray, vec: np.ndarray) -> np.ndarray:
+    """Cosine similarity of a unit vector against each row of matrix.
+    
+    Rows must be unit-normalized or all-zero (zero rows score 0.0), so the
+    cosine is the plain dot product.
+    
+    Args:
+        matrix: Array of shape (N, dim).
+        vec: Unit vector of shape (dim,).
+        
+    Returns:
+        Array of shape (N,) with similarities in [-1, 1].
+    """
+    return matrix @ vec
+
+
+def _cosine_batch_i8(matrix_i8: np.ndarray, vec_i8: np.ndarray) -> np.ndarray:
+    """Approximate cosine of an int8 unit vector against int8 matrix rows.
+    
+    Dot products are accumulated in int32 and rescaled by I8_SCALE**2.
+    
+    Args:
+        matrix_i8: int8 array of shape (N, dim), see quantize_i8().
+        vec_i8: int8 array of shape (dim,).
+        
+    Returns:
+        float32 array of shape (N,) with similarities in about [-1, 1].
+    """
+    dots = matrix_i8.astype(np.int32) @ vec_i8.astype(np.int32)
+    return dots.astype(np.float32) / np.float32(I8_SCALE * I8_SCALE)
+
+
 def retrieve_candidates(
-    goal_text: str,
+    goal_text: Union[str, QueryContext],
     store: SemanticMemoryStore,
     embedder: DeterministicEmbedder,
-    k: int = 5
+    k: int = 5,
+    quantized: bool = False
 ) -> list[dict]:
     """Retrieve top-k memory nodes matching goal_text.
     
@@ -47,74 +148,166 @@ def retrieve_candidates(
     Deterministic ordering with explicit tie-breaking by node_id.
     
     Args:
-        goal_text: Natural language goal description.
+        goal_text: Natural language goal description, or a QueryContext
+            built once for a goal that is queried repeatedly.
         store: Semantic memory store to search.
         embedder: Text embedder for computing similarity.
         k: Maximum number of candidates to return (default 5).
+        quantized: If True, score embeddings with int8-quantized vectors
+            (approximate, about 1e-2 cosine error) instead of float32.
         
     Returns:
         List of candidates sorted by score (descending), each with:
         - node_id: int
         - score: float in [0.0, 1.0]
     """
-    # Tokenize goal text
-    goal_tokens = tokenize(goal_text)
+    if isinstance(goal_text, QueryContext):
+        ctx = goal_text
+        goal_tokens = ctx.goal_tokens
+    else:
+        ctx = None
+        goal_tokens = tokenize(goal_text)
     
     # If no valid tokens, return empty list immediately
     if not goal_tokens:
         return []
     
     # Embed goal text
-    goal_embedding = embedder.embed_text(goal_text)
-    goal_token_set = set(goal_tokens)
-    
-    # Get all nodes and sort by node_id for determinism
-    nodes = store.all_nodes()
-    nodes_sorted = sorted(nodes, key=lambda n: n.node_id)
-    
-    # Score each node
-    candidates = []
-    for node in nodes_sorted:
-        # Compute embedding similarity
-        if node.embedding is not None:
-            node_vec = node.embedding
-        else:
-            # Use embedding of summary + tags
-            node_text = node.summary + " " + " ".join(node.tags)
-            node_vec = embedder.embed_text(node_text)
+    if ctx is None:
+        ctx = QueryContext(goal_text, embedder.embed_text(goal_text), goal_tokens)
+    goal_embedding = ctx.goal_embedding
+    goal_mask = ctx.goal_mask(store)
+    
+    # Per-node data is held as parallel arrays ordered by node_id
+    num_nodes = len(store.nodes)
+    if num_nodes == 0 or k <= 0:
+        return []
+    
+    # Embedding similarity for all nodes in one matrix-vector product.
+    # Matrix rows and the goal embedding are unit-normalized (embed_text
+    # output), so cosine reduces to a dot product. Rows ordered by node_id.
+    if not goal_embedding.any():
+        cos_sims = np.zeros(num_nodes, dtype=np.float32)
+    elif quantized:
+        cos_sims = _cosine_batch_i8(
+            store.embedding_matrix_i8(embedder), quantize_i8(goal_embedding)
+        )
+    else:
+        cos_sims = _cosine_batch_unit(store.embedding_matrix(embedder), goal_embedding)
+    # Map cosine [-1, 1] to [0, 1]
+    embedding_scores = 0.5 * (cos_sims + 1.0)
+    
+    # Keyword overlap per node (node token bitmasks cached at insert time)
+    overlaps = np.fromiter(
+        ((goal_mask & mask).bit_count() for mask in store.token_masks()),
+        dtype=np.int64,
+        count=num_nodes
+    )
+    final_scores = _blend_scores(embedding_scores, overlaps, len(goal_tokens))
+    node_ids = store.node_ids()
+    
+    top = _top_k_indices(final_scores, node_ids, k)
+    
+    # Ensure output uses Python types (not numpy)
+    return [
+        {"node_id": int(node_ids[i]), "score": float(final_scores[i])}
+        for i in top
+    ]
+
+
+def _blend_scores_np(
+    embedding_scores: np.ndarray,
+    overlaps: np.ndarray,
+    n_goal_tokens: int
+) -> np.ndarray:
+    """Blend embedding and keyword scores for every node, as array ops.
+    
+    The scoring rules live here; _blend_scores_py is the same computation
+    as a loop for numba to compile, and must stay in sync (same float64
+    operations in the same order, so results match bit for bit).
+    
+    Args:
+        embedding_scores: Embedding scores in [0, 1], shape (N,).
+        overlaps: Keyword overlap counts, shape (N,).
+        n_goal_tokens: Number of goal tokens (> 0).
         
-        cos_sim = cosine_similarity(goal_embedding, node_vec)
-        # Map cosine [-1, 1] to [0, 1]
-        embedding_score = (cos_sim + 1.0) / 2.0
+    Returns:
+        float64 array of final scores in [0, 1], shape (N,).
+    """
+    embedding_scores = embedding_scores.astype(np.float64)
+    keyword_scores = overlaps / n_goal_tokens
+    
+    # Blend scores: 0.8 embedding + 0.2 keywords
+    final_scores = 0.8 * embedding_scores + 0.2 * keyword_scores
+    
+    # Garbage candidate guard: halve low-signal matches (no keyword overlap,
+    # near-random embedding score)
+    guard = (keyword_scores == 0.0) & (np.abs(embedding_scores - 0.5) < 0.05)
+    final_scores[guard] *= 0.5
+    
+    # Clamp to [0, 1] for numeric safety
+    return np.clip(final_scores, 0.0, 1.0, out=final_scores)
+
+
+def _blend_scores_py(
+    embedding_scores: np.ndarray,
+    overlaps: np.ndarray,
+    n_goal_tokens: int
+) -> np.ndarray:
+    """Loop form of _blend_scores_np, compiled with numba.njit when installed.
+    
+    Fuses the blend, guard and clamp into one pass once compiled; only used
+    interpreted by the parity test.
+    
+    Args:
+        embedding_scores: Embedding scores in [0, 1], shape (N,).
+        overlaps: Keyword overlap counts, shape (N,).
+        n_goal_tokens: Number of goal tokens (> 0).
         
-        # Compute keyword overlap
-        node_text = node.summary + " " + " ".join(node.tags)
-        node_tokens = set(tokenize(node_text))
-        overlap = len(goal_token_set & node_tokens)
-        keyword_score = overlap / len(goal_tokens)  # Safe: goal_tokens is non-empty
+    Returns:
+        float64 array of final scores in [0, 1], shape (N,).
+    """
+    final_scores = np.empty(len(embedding_scores), dtype=np.float64)
+    for i in range(len(embedding_scores)):
+        embedding_score = float(embedding_scores[i])
+        keyword_score = overlaps[i] / n_goal_tokens
         
-        # Blend scores: 0.8 embedding + 0.2 keywords
         final_score = 0.8 * embedding_score + 0.2 * keyword_score
-        
-        # Garbage candidate guard: penalize low-signal matches
-        # If no keyword overlap and embedding is near-random (0.5), reduce score
         if keyword_score == 0.0 and abs(embedding_score - 0.5) < 0.05:
             final_score = final_score * 0.5
-        
-        # Clamp to [0, 1] for numeric safety
-        final_score = max(0.0, min(1.0, final_score))
-        
-        # Ensure score is Python float (not numpy)
-        final_score = float(final_score)
-        
-        candidates.append({
-            "node_id": node.node_id,
-            "score": final_score
-        })
+        final_scores[i] = max(0.0, min(1.0, final_score))
+    return final_scores
+
+
+# No fastmath: scores must match _blend_scores_np bit for bit
+_blend_scores = (
+    njit(cache=True)(_blend_scores_py) if njit is not None else _blend_scores_np
+)
+
+
+def _top_k_indices(scores: np.ndarray, node_ids: np.ndarray, k: int) -> np.ndarray:
+    """Select indices of the top-k scores without sorting all candidates.
     
-    # Sort by score (descending) with tie-break by node_id (ascending)
-    candidates_sorted = sorted(candidates, key=lambda c: (-c["score"], c["node_id"]))
+    Uses np.argpartition (introselect, O(N)) to find the k-th best score,
+    then np.lexsort orders only the candidates at or above it. Ordering is
+    score descending with tie-break by node_id ascending, identical to a
+    full sort.
     
-    # Return top-k
-    return candidates_sorted[:k]
-
+    Args:
+        scores: Final scores, shape (N,).
+        node_ids: Node IDs aligned with scores, shape (N,).
+        k: Number of indices to return (k >= 1).
+        
+    Returns:
+        Up to k indices into scores.
+    """
+    if k < len(scores):
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        # Keep every candidate tied with the k-th score so tie-break is exact
+        pool = np.flatnonzero(scores >= kth_score)
+    else:
+        pool = np.arange(len(scores))
+    
+    # lexsort: last key is primary (score desc), then node_id asc
+    order = np.lexsort((node_ids[pool], -scores[pool]))
+    return pool[order[:k]]
@@ -1,8 +1,13 @@
 """Semantic memory store for topological navigation."""
 
-from typing import Optional
+import itertools
+from typing import Iterable, Optional
 
+import numpy as np
+
+from memory.embedding import DeterministicEmbedder, normalize, quantize_i8
 from memory.types import MemoryNode, Pose2D
+from memory.utils import tokenize
 
 
 class SemanticMemoryStore:
@@ -11,15 +16,44 @@ class SemanticMemoryStore:
     Maintains a dictionary of memory nodes indexed by node_id.
     """
     
-    def __init__(self) -> None:
-        """Initialize empty memory store."""
+    # Source of per-instance uids; never reused within a process
+    _uids = itertools.count()
+    
+    def __init__(self, embedder: Optional[DeterministicEmbedder] = None) -> None:
+        """Initialize empty memory store.
+        
+        Args:
+            embedder: Optional embedder used to compute missing node
+                embeddings once at insert time.
+        """
+        self.embedder = embedder
+        self._uid: int = next(SemanticMemoryStore._uids)
         self.nodes: dict[int, MemoryNode] = {}
         self._next_id: int = 0
+        # Bumped on every mutation so callers can cache query results
+        self._version: int = 0
+        
+        # Contiguous (capacity, dim) float32 buffer of unit-normalized node
+        # embeddings; the first _num_rows rows are live, ordered by node_id.
+        # Built on first query, then add_node appends rows in place (capacity
+        # doubles when full). A different embedder forces a rebuild.
+        self._embeddings: Optional[np.ndarray] = None
+        self._node_id_buf: Optional[np.ndarray] = None
+        self._num_rows: int = 0
+        self._embedding_matrix_i8: Optional[np.ndarray] = None
+        self._matrix_embedder: Optional[DeterministicEmbedder] = None
+        self._matrix_dirty: bool = True
+        
+        # Token vocabulary: each distinct node token owns one bit, so keyword
+        # overlap is an AND + popcount on Python ints (arbitrary width, exact).
+        self._token_to_bit: dict[str, int] = {}
+        # Per-node token masks aligned with node_ids(), appended by add_node
+        self._token_masks: Optional[list[int]] = None
     
     def add_node(
         self,
         pose: Pose2D,
-        embedding: Optional[list[float]],
+        embedding: Optional[np.ndarray],
         tags: list[str],
         summary: str
     ) -> int:
@@ -27,24 +61,82 @@ class SemanticMemoryStore:
         
         Args:
             pose: 2D pose of the node.
-            embedding: Optional pre-computed embedding vector.
+            embedding: Optional pre-computed embedding vector. If None and
+                the store has an embedder, it is computed from summary + tags.
             tags: List of semantic tags.
             summary: Natural language description.
             
         Returns:
             node_id: Unique identifier for the created node.
         """
+        node_id = self._add_one(pose, embedding, tags, summary)
+        self._version += 1
+        return node_id
+    
+    def add_nodes(self, specs: Iterable[dict]) -> list[int]:
+        """Add several memory nodes in one call.
+        
+        Equivalent to calling add_node(**spec) for each spec in order, with
+        the version bumped once per node after the batch is inserted. A
+        built embedding buffer is grown once up front for the whole batch.
+        
+        Args:
+            specs: Dicts with add_node's keyword arguments (pose, embedding,
+                tags, summary).
+            
+        Returns:
+            node_ids of the created nodes, in insertion order.
+        """
+        specs = list(specs)
+        if not self._matrix_dirty and self._matrix_embedder is not None:
+            # Live buffer: grow it at most once for the whole batch
+            self._reserve_rows(self._num_rows + len(specs))
+        
+        add_one = self._add_one
+        node_ids = [
+            add_one(spec["pose"], spec["embedding"], spec["tags"], spec["summary"])
+            for spec in specs
+        ]
+        self._version += len(node_ids)
+        return node_ids
+    
+    def _add_one(
+        self,
+        pose: Pose2D,
+        embedding: Optional[np.ndarray],
+        tags: list[str],
+        summary: str
+    ) -> int:
+        """Insert one node and update the caches, without bumping the version."""
         node_id = self._next_id
         self._next_id += 1
         
+        combined_text = summary + " " + " ".join(tags)
+        if embedding is None and self.embedder is not None:
+            embedding = self.embedder.embed_text(combined_text)
+        
+        token_set = frozenset(tokenize(combined_text))
+        for token in token_set:
+            if token not in self._token_to_bit:
+                self._token_to_bit[token] = len(self._token_to_bit)
+        
         node = MemoryNode(
             node_id=node_id,
             pose=pose,
             embedding=embedding,
             tags=tags,
-            summary=summary
+            summary=summary,
+            combined_text=combined_text,
+            token_set=token_set,
+            token_mask=self.token_mask(token_set)
         )
         self.nodes[node_id] = node
+        if self._matrix_dirty or self._matrix_embedder is None:
+            self._matrix_dirty = True
+        else:
+            self._append_row(node)
+        if self._token_masks is not None:
+            self._token_masks.append(node.token_mask)
         return node_id
     
     def get_node(self, node_id: int) -> Optional[MemoryNode]:
@@ -65,15 +157,153 @@ class SemanticMemoryStore:
             List of all memory nodes.
         """
         return list(self.nodes.values())
+    
+    @property
+    def version(self) -> int:
+        """Mutation counter, incremented once per node added."""
+        return self._version
+    
+    @property
+    def uid(self) -> int:
+        """Process-unique store identifier (unlike id(), never reused)."""
+        return self._uid
+    
+    @property
+    def vocab_size(self) -> int:
+        """Number of distinct node tokens with an assigned mask bit."""
+        return len(self._token_to_bit)
+    
+    def token_mask(self, tokens: Iterable[str]) -> int:
+        """Encode tokens as a bitmask over the store vocabulary.
+        
+        Tokens that no node contains have no bit and are ignored, since
+        they cannot contribute to keyword overlap.
+        
+        Args:
+            tokens: Tokens to encode.
+            
+        Returns:
+            Integer with one bit set per known token.
+        """
+        token_to_bit = self._token_to_bit
+        mask = 0
+        for token in tokens:
+            bit = token_to_bit.get(token)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def token_masks(self) -> list[int]:
+        """Get per-node token bitmasks aligned with node_ids().
+        
+        Returns:
+            List of token masks ordered by node_id.
+        """
+        if self._token_masks is None:
+            self._token_masks = [self.nodes[node_id].token_mask for node_id in sorted(self.nodes)]
+        return self._token_masks
+    
+    def embedding_matrix(self, embedder: DeterministicEmbedder) -> np.ndarray:
+        """Get the stacked embedding matrix for all nodes.
+        
+        Rows are unit-normalized float32 embeddings ordered by node_id
+        (aligned with node_ids()). Nodes without a pre-computed embedding
+        are embedded from summary + tags. The matrix is a view of a
+        contiguous buffer that add_node extends in place; it is only rebuilt
+        when a different embedder is used.
+        
+        Args:
+            embedder: Text embedder for nodes without an embedding.
+            
+        Returns:
+            Array of shape (N, embedder.dim).
+        """
+        if self._matrix_dirty or embedder is not self._matrix_embedder:
+            self._rebuild_embedding_matrix(embedder)
+        return self._embeddings[:self._num_rows]
+    
+    def embedding_matrix_i8(self, embedder: DeterministicEmbedder) -> np.ndarray:
+        """Get the int8-quantized embedding matrix for all nodes.
+        
+        Quantized from embedding_matrix() on first use and cached until the
+        float matrix changes.
+        
+        Args:
+            embedder: Text embedder for nodes without an embedding.
+            
+        Returns:
+            int8 array of shape (N, embedder.dim).
+        """
+        matrix = self.embedding_matrix(embedder)
+        if self._embedding_matrix_i8 is None:
+            self._embedding_matrix_i8 = quantize_i8(matrix)
+        return self._embedding_matrix_i8
+    
+    def node_ids(self) -> np.ndarray:
+        """Get node IDs aligned with the rows of embedding_matrix().
+        
+        Returns:
+            int64 array of node IDs in ascending order.
+        """
+        if self._matrix_dirty:
+            return np.array(sorted(self.nodes), dtype=np.int64)
+        return self._node_id_buf[:self._num_rows]
+    
+    def _rebuild_embedding_matrix(self, embedder: DeterministicEmbedder) -> None:
+        """Rebuild the embedding buffer and node_id index for embedder."""
+        node_ids = sorted(self.nodes)
+        capacity = max(len(node_ids), 8)
+        self._embeddings = np.zeros((capacity, embedder.dim), dtype=np.float32)
+        self._node_id_buf = np.zeros(capacity, dtype=np.int64)
+        self._num_rows = 0
+        self._matrix_embedder = embedder
+        
+        for node_id in node_ids:
+            self._append_row(self.nodes[node_id])
+        
+        self._matrix_dirty = False
+    
+    def _reserve_rows(self, rows: int) -> None:
+        """Ensure the embedding buffer can hold at least rows rows."""
+        if rows <= len(self._embeddings):
+            return
+        # Amortized growth: at least double capacity, copy live rows once
+        capacity = max(rows, 2 * len(self._embeddings))
+        embeddings = np.zeros((capacity, self._embeddings.shape[1]), dtype=np.float32)
+        embeddings[:self._num_rows] = self._embeddings[:self._num_rows]
+        node_id_buf = np.zeros(capacity, dtype=np.int64)
+        node_id_buf[:self._num_rows] = self._node_id_buf[:self._num_rows]
+        self._embeddings = embeddings
+        self._node_id_buf = node_id_buf
+    
+    def _append_row(self, node: MemoryNode) -> None:
+        """Append node's embedding as the next row of the buffer."""
+        embedder = self._matrix_embedder
+        self._reserve_rows(self._num_rows + 1)
+        
+        row = self._num_rows
+        if node.embedding is not None:
+            vec = np.asarray(node.embedding, dtype=np.float32)
+            if vec.shape == (embedder.dim,):
+                self._embeddings[row] = normalize(vec)
+            # Dimension mismatch: leave zero row (cosine 0.0)
+        else:
+            self._embeddings[row] = embedder.embed_text(node.combined_text)
+        self._node_id_buf[row] = node.node_id
+        self._num_rows = row + 1
+        self._embedding_matrix_i8 = None
 
 
-def seed_demo_store() -> SemanticMemoryStore:
+def seed_demo_store(embedder: Optional[DeterministicEmbedder] = None) -> SemanticMemoryStore:
     """Create a demo store with sample nodes for testing.
     
+    Args:
+        embedder: Optional embedder to pre-compute node embeddings.
+    
     Returns:
         SemanticMemoryStore with 5 demo nodes.
     """
-    store = SemanticMemoryStore()
+    store = SemanticMemoryStore(embedder)
     
     # Node 0: Kitchen area
     store.add_node(
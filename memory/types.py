@@ -1,8 +1,10 @@
 """Core types for semantic memory representation."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
 
 @dataclass
 class Pose2D:
@@ -28,10 +30,16 @@ class MemoryNode:
         embedding: Optional pre-computed embedding vector.
         tags: List of semantic tags (e.g., ["kitchen", "doorway"]).
         summary: Natural language description of the node.
+        combined_text: Cached summary + " " + tags text (set at insert).
+        token_set: Cached keyword tokens of combined_text (set at insert).
+        token_mask: Bitmask of token_set over the store vocabulary (set at insert).
     """
     node_id: int
     pose: Pose2D
-    embedding: Optional[list[float]]
+    embedding: Optional[np.ndarray]
     tags: list[str]
     summary: str
+    combined_text: str = field(default="", repr=False)
+    token_set: frozenset[str] = field(default=frozenset(), repr=False)
+    token_mask: int = field(default=0, repr=False)
 
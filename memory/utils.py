@@ -1,32 +1,43 @@
 """Utility functions for semantic memory processing."""
 
 import re
+import sys
+from functools import lru_cache
 
+# Punctuation (anything that is neither a word character nor whitespace)
+_PUNCT_RE = re.compile(r'[^\w\s]')
 
-def tokenize(text: str) -> list[str]:
+# Translation table deleting exactly the ASCII characters _PUNCT_RE
+# removes, for the common all-ASCII case
+_ASCII_PUNCT_TABLE = str.maketrans({
+    chr(code): None for code in range(128) if _PUNCT_RE.match(chr(code))
+})
+
+
+@lru_cache(maxsize=1024)
+def tokenize(text: str) -> tuple[str, ...]:
     """Tokenize text with robust normalization.
     
     Normalizes text by:
     - Converting to lowercase
-    - Stripping whitespace
-    - Removing punctuation
-    - Splitting on whitespace
-    - Filtering out empty tokens
+    - Removing punctuation (including non-ASCII, e.g. em dashes and
+      curly quotes)
+    - Splitting on whitespace (drops empty tokens)
+    
+    ASCII text takes a str.translate fast path that matches the regex.
+    Results are memoized, so a tuple is returned to keep cached values
+    immutable. Tokens are interned, so the store vocabulary and goal
+    tokens share string objects and dict lookups match on identity.
     
     Args:
         text: Input text to tokenize.
         
     Returns:
-        List of non-empty tokens.
+        Tuple of non-empty tokens.
     """
-    # Lowercase and strip
-    normalized = text.lower().strip()
-    
-    # Remove punctuation
-    no_punct = re.sub(r'[^\w\s]', '', normalized)
-    
-    # Split on whitespace and filter empty strings
-    tokens = [token for token in no_punct.split() if token]
-    
-    return tokens
-
+    text = text.lower()
+    if text.isascii():
+        text = text.translate(_ASCII_PUNCT_TABLE)
+    else:
+        text = _PUNCT_RE.sub('', text)
+    return tuple(map(sys.intern, text.split()))
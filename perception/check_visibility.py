@@ -1,14 +1,193 @@
 """Visibility checking function for perception gate."""
 
+import itertools
+import os
 import time
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
 
 from perception.config import (
     DEFAULT_PERCEPTION_BACKEND,
-    get_node_oracle_map,
+    get_node_oracle_map_view,
     normalize_goal_text,
-    get_node_oracle_relpose_map
+    get_node_oracle_relpose_map,
+    get_flat_relpose,
+    RelposeEntry
 )
+from perception.types import VisibilityResult
+
+# Latency measurement can be switched off (PERCEPTION_TIMING=0) for tight
+# control loops; latency_ms is then always reported as 0.
+_TIMING_ENABLED = os.environ.get("PERCEPTION_TIMING", "1").strip().lower() not in (
+    "0", "false", "no", "off"
+)
+
+
+def _parse_timing_every(value: Optional[str]) -> int:
+    """Parse PERCEPTION_TIMING_EVERY; unset or malformed values mean 1."""
+    try:
+        return max(1, int(value or "1"))
+    except ValueError:
+        return 1
+
+
+# Sample the clock on every Nth call only (PERCEPTION_TIMING_EVERY=N);
+# calls in between were not measured and report latency_ms=0.
+_TIMING_EVERY = _parse_timing_every(os.environ.get("PERCEPTION_TIMING_EVERY"))
+# Call counter for sampling; next() on itertools.count is atomic under the GIL
+_timing_ticks = itertools.count()
+
+
+def _handle_node_oracle(
+    result: VisibilityResult,
+    goal_text: str,
+    current_node_id: Optional[int],
+    config: Optional[Dict]
+) -> None:
+    """Fill result from the node_oracle backend (node_id -> confidence)."""
+    # Get oracle map from config or default
+    if config and "oracle_map" in config:
+        oracle_map = config["oracle_map"]
+    else:
+        oracle_map = get_node_oracle_map_view()
+    
+    # Check if current node is in oracle map
+    if current_node_id is not None and current_node_id in oracle_map:
+        confidence = oracle_map[current_node_id]
+        result.is_visible = True
+        result.confidence = confidence
+        result.reason = "oracle_hit"
+        result.extra["oracle_confidence"] = confidence
+    else:
+        result.is_visible = False
+        result.confidence = 0.0
+        result.reason = "oracle_miss"
+        if current_node_id is None:
+            result.extra["note"] = "current_node_id is None"
+        else:
+            result.extra["note"] = f"node {current_node_id} not in oracle map"
+
+
+def _node_oracle_none_result() -> Dict[str, Any]:
+    """Return the node_oracle miss for current_node_id=None, as a fresh dict.
+    
+    Same shape and values as the full path (see _handle_node_oracle) with
+    latency_ms=0, built directly since no lookup or timing is needed.
+    """
+    return {
+        "is_visible": False,
+        "confidence": 0.0,
+        "backend": "node_oracle",
+        "latency_ms": 0,
+        "distance_m": None,
+        "bearing_rad": None,
+        "target_goal_key": None,
+        "evidence": {
+            "reason": "oracle_miss",
+            "node_id": None,
+            "extra": {"note": "current_node_id is None"}
+        }
+    }
+
+
+def _nested_relpose_entry(
+    relpose_map: Mapping[str, Mapping[int, Mapping[str, float]]],
+    goal_key: str,
+    current_node_id: Optional[int]
+) -> Optional[RelposeEntry]:
+    """Look (goal_key, current_node_id) up in a nested relpose map.
+    
+    Returns the same tuple as the flat view, or None if unmapped. A
+    malformed entry raises (AttributeError/TypeError), which
+    check_visibility() reports as reason "exception".
+    """
+    if current_node_id is None or goal_key not in relpose_map:
+        return None
+    data = relpose_map[goal_key].get(current_node_id)
+    if not data:
+        return None
+    return (data.get("distance_m"), data.get("bearing_rad"), data.get("confidence"))
+
+
+def _handle_node_oracle_relpose(
+    result: VisibilityResult,
+    goal_text: str,
+    current_node_id: Optional[int],
+    config: Optional[Dict]
+) -> None:
+    """Fill result from the node_oracle_relpose backend (goal, node) -> relpose."""
+    # Normalize goal for consistent lookup
+    goal_key = normalize_goal_text(goal_text)
+    result.target_goal_key = goal_key
+    
+    # Config maps are read directly, so callers may mutate them between
+    # calls. The global map goes through its flat (goal_key, node_id) view
+    # (see refresh_relpose_map()); a miss there is re-checked in the nested
+    # view, so entries skipped by flattening as malformed still raise.
+    if config and "relpose_map" in config:
+        relpose_map = config["relpose_map"]
+        entry = _nested_relpose_entry(relpose_map, goal_key, current_node_id)
+    else:
+        relpose_map = get_node_oracle_relpose_map()
+        entry = get_flat_relpose().get((goal_key, current_node_id))
+        if entry is None:
+            entry = _nested_relpose_entry(relpose_map, goal_key, current_node_id)
+    
+    if entry is not None:
+        distance_m, bearing_rad, confidence = entry
+        
+        # Fallback confidence: try visibility map, then default to 1.0
+        if confidence is None:
+            confidence = get_node_oracle_map_view().get(current_node_id, 1.0)
+        
+        # FIX D: Clamp confidence to [0.0, 1.0]
+        try:
+            confidence = float(confidence)
+            confidence = max(0.0, min(1.0, confidence))
+        except (TypeError, ValueError):
+            confidence = 0.0  # Invalid value → safe default
+        
+        # Visibility decision: confidence > 0.0 (deterministic)
+        result.is_visible = confidence > 0.0
+        result.confidence = confidence
+        result.distance_m = distance_m
+        result.bearing_rad = bearing_rad
+        result.reason = "relpose_hit"
+        result.extra["goal_key"] = goal_key
+        result.extra["distance_m"] = distance_m
+        result.extra["bearing_rad"] = bearing_rad
+        result.extra["confidence"] = confidence
+    else:
+        # Goal or node not found
+        result.is_visible = False
+        result.confidence = 0.0
+        # TWEAK 3: Explicitly set to None in miss paths
+        result.distance_m = None
+        result.bearing_rad = None
+        result.reason = "relpose_miss"
+        if current_node_id is None:
+            result.extra["note"] = "current_node_id is None"
+        elif goal_key not in relpose_map:
+            result.extra["note"] = f"goal_key '{goal_key}' not in relpose map"
+        else:
+            result.extra["note"] = f"node {current_node_id} not mapped for goal '{goal_key}'"
+
+
+def _handle_unknown(
+    result: VisibilityResult,
+    goal_text: str,
+    current_node_id: Optional[int],
+    config: Optional[Dict]
+) -> None:
+    """Fill result for a backend with no registered handler."""
+    result.reason = "unknown_backend"
+    result.extra["error"] = f"Unknown backend: {result.backend}"
+
+
+# Backend name -> handler; each handler fills in the VisibilityResult
+_BACKEND_HANDLERS: Dict[str, Callable[[VisibilityResult, str, Optional[int], Optional[Dict]], None]] = {
+    "node_oracle": _handle_node_oracle,
+    "node_oracle_relpose": _handle_node_oracle_relpose,
+}
 
 
 def check_visibility(
@@ -17,7 +196,8 @@ def check_visibility(
     memory_context: Optional[List],
     belief_state: Union[object, Dict[str, Any]],
     backend: Optional[str] = None,
-    config: Optional[Dict] = None
+    config: Optional[Dict] = None,
+    measure_latency: bool = True
 ) -> Dict[str, Any]:
     """Check if the goal is visible at the current location.
     
@@ -31,13 +211,17 @@ def check_visibility(
         belief_state: Current belief state (dict or object)
         backend: Perception backend to use, defaults to DEFAULT_PERCEPTION_BACKEND
         config: Optional config override dict (for testing)
+        measure_latency: If False, skip the timer for this call and report
+            latency_ms as 0 (for callers that do not log latency)
     
     Returns:
         VisibilityResult dict with keys:
             - is_visible: bool indicating if target is visible
             - confidence: float 0.0 to 1.0
             - backend: str indicating backend used
-            - latency_ms: int milliseconds taken
+            - latency_ms: int milliseconds taken (0 if not measured:
+              PERCEPTION_TIMING=0, measure_latency=False, or a call skipped
+              by PERCEPTION_TIMING_EVERY)
             - distance_m: Optional[float] distance to target in meters (relpose only)
             - bearing_rad: Optional[float] bearing to target in radians (relpose only)
             - target_goal_key: Optional[str] normalized goal text (relpose only, debug)
@@ -46,133 +230,37 @@ def check_visibility(
                 - node_id: int or None
                 - extra: dict with additional info
     """
-    start_time = time.perf_counter()
-    
     # Resolve backend
     if backend is None:
         backend = DEFAULT_PERCEPTION_BACKEND
     
+    # Fast path: node_oracle cannot hit without a node (e.g. before the
+    # robot has localized), whatever the oracle map or config holds
+    if current_node_id is None and backend == "node_oracle":
+        return _node_oracle_none_result()
+    
+    if measure_latency and _TIMING_ENABLED:
+        timed = _TIMING_EVERY == 1 or next(_timing_ticks) % _TIMING_EVERY == 0
+    else:
+        timed = False
+    start_ns = time.perf_counter_ns() if timed else 0
+    
     # Initialize result structure
-    result: Dict[str, Any] = {
-        "is_visible": False,
-        "confidence": 0.0,
-        "backend": backend,
-        "latency_ms": 0,
-        "distance_m": None,      # NEW: initialize to None
-        "bearing_rad": None,     # NEW: initialize to None
-        "target_goal_key": None, # NEW: initialize to None
-        "evidence": {
-            "reason": "not_checked",
-            "node_id": current_node_id,
-            "extra": {}
-        }
-    }
+    result = VisibilityResult(backend=backend, node_id=current_node_id)
+    handler = _BACKEND_HANDLERS.get(backend, _handle_unknown)
     
     try:
-        if backend == "node_oracle":
-            # Get oracle map from config or default
-            if config and "oracle_map" in config:
-                oracle_map = config["oracle_map"]
-            else:
-                oracle_map = get_node_oracle_map()
-            
-            # Check if current node is in oracle map
-            if current_node_id is not None and current_node_id in oracle_map:
-                confidence = oracle_map[current_node_id]
-                result["is_visible"] = True
-                result["confidence"] = confidence
-                result["evidence"]["reason"] = "oracle_hit"
-                result["evidence"]["extra"]["oracle_confidence"] = confidence
-            else:
-                result["is_visible"] = False
-                result["confidence"] = 0.0
-                result["evidence"]["reason"] = "oracle_miss"
-                if current_node_id is None:
-                    result["evidence"]["extra"]["note"] = "current_node_id is None"
-                else:
-                    result["evidence"]["extra"]["note"] = f"node {current_node_id} not in oracle map"
-        elif backend == "node_oracle_relpose":
-            # Get relpose map from config or default
-            if config and "relpose_map" in config:
-                relpose_map = config["relpose_map"]
-            else:
-                relpose_map = get_node_oracle_relpose_map()
-            
-            # Normalize goal for consistent lookup
-            goal_key = normalize_goal_text(goal_text)
-            result["target_goal_key"] = goal_key
-            
-            # Lookup (goal_key, current_node_id)
-            if current_node_id is not None and goal_key in relpose_map:
-                node_data = relpose_map[goal_key].get(current_node_id)
-                
-                if node_data:
-                    # Extract fields (use .get() for safety)
-                    distance_m = node_data.get("distance_m")
-                    bearing_rad = node_data.get("bearing_rad")
-                    confidence = node_data.get("confidence")
-                    
-                    # Fallback confidence: try visibility map, then default to 1.0
-                    if confidence is None:
-                        oracle_map = get_node_oracle_map()
-                        confidence = oracle_map.get(current_node_id, 1.0)
-                    
-                    # FIX D: Clamp confidence to [0.0, 1.0]
-                    try:
-                        confidence = float(confidence)
-                        confidence = max(0.0, min(1.0, confidence))
-                    except (TypeError, ValueError):
-                        confidence = 0.0  # Invalid value → safe default
-                    
-                    # Visibility decision: confidence > 0.0 (deterministic)
-                    result["is_visible"] = confidence > 0.0
-                    result["confidence"] = confidence
-                    result["distance_m"] = distance_m
-                    result["bearing_rad"] = bearing_rad
-                    result["evidence"]["reason"] = "relpose_hit"
-                    result["evidence"]["extra"]["goal_key"] = goal_key
-                    result["evidence"]["extra"]["distance_m"] = distance_m
-                    result["evidence"]["extra"]["bearing_rad"] = bearing_rad
-                    result["evidence"]["extra"]["confidence"] = confidence
-                else:
-                    # Node not mapped for this goal
-                    result["is_visible"] = False
-                    result["confidence"] = 0.0
-                    # TWEAK 3: Explicitly set to None in miss paths
-                    result["distance_m"] = None
-                    result["bearing_rad"] = None
-                    result["evidence"]["reason"] = "relpose_miss"
-                    result["evidence"]["extra"]["note"] = f"node {current_node_id} not mapped for goal '{goal_key}'"
-            else:
-                # Goal or node not found
-                result["is_visible"] = False
-                result["confidence"] = 0.0
-                # TWEAK 3: Explicitly set to None in miss paths
-                result["distance_m"] = None
-                result["bearing_rad"] = None
-                result["evidence"]["reason"] = "relpose_miss"
-                if current_node_id is None:
-                    result["evidence"]["extra"]["note"] = "current_node_id is None"
-                elif goal_key not in relpose_map:
-                    result["evidence"]["extra"]["note"] = f"goal_key '{goal_key}' not in relpose map"
-                else:
-                    result["evidence"]["extra"]["note"] = f"node {current_node_id} not in goal '{goal_key}' mapping"
-        else:
-            # Unknown backend
-            result["evidence"]["reason"] = "unknown_backend"
-            result["evidence"]["extra"]["error"] = f"Unknown backend: {backend}"
-    
-    except Exception as e:
-        # Fail-safe: return safe default on any exception
-        result["is_visible"] = False
-        result["confidence"] = 0.0
-        result["evidence"]["reason"] = "exception"
-        result["evidence"]["extra"]["error"] = str(e)
-        result["evidence"]["extra"]["exception_type"] = type(e).__name__
+        handler(result, goal_text, current_node_id, config)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        # Fail-safe: return safe default on malformed maps/config
+        result.is_visible = False
+        result.confidence = 0.0
+        result.reason = "exception"
+        result.extra["error"] = str(e)
+        result.extra["exception_type"] = type(e).__name__
     
     # Calculate latency
-    end_time = time.perf_counter()
-    result["latency_ms"] = int((end_time - start_time) * 1000)
+    if timed:
+        result.latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
     
-    return result
-
+    return result.as_dict()
@@ -4,7 +4,11 @@ This module contains the configuration for the perception visibility checking sy
 The oracle map defines which nodes have visible targets (for testing/simulation).
 """
 
-from typing import Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
 
 # Default perception backend
 DEFAULT_PERCEPTION_BACKEND = "node_oracle"
@@ -24,6 +28,10 @@ NODE_ORACLE_MAP: Dict[int, float] = {}
 #   }
 NODE_ORACLE_RELPOSE_MAP: Dict[str, Dict[int, Dict[str, float]]] = {}
 
+# Flattened relpose entry: (distance_m, bearing_rad, confidence); confidence
+# is None when the nested entry omits it.
+RelposeEntry = Tuple[Optional[float], Optional[float], Optional[float]]
+
 
 def get_node_oracle_map() -> Dict[int, float]:
     """Get a copy of the node oracle map.
@@ -33,13 +41,111 @@ def get_node_oracle_map() -> Dict[int, float]:
     Returns:
         Dictionary mapping node_id to confidence (0.0 to 1.0)
     """
-    return NODE_ORACLE_MAP.copy()
+    return dict(NODE_ORACLE_MAP)
+
+
+class DenseOracleMap(Mapping[int, float]):
+    """Read-only node oracle map backed by a dense float64 array.
+    
+    For large graphs with mostly contiguous node ids: one 8-byte slot per
+    node instead of a dict entry. NaN marks nodes that are not in the map,
+    so membership and confidences (including 0.0) match the dict form
+    exactly. Usable wherever an oracle map is read: as NODE_ORACLE_MAP or
+    as config["oracle_map"] in check_visibility().
+    """
+    
+    __slots__ = ("_values", "_len")
+    
+    def __init__(self, values: np.ndarray) -> None:
+        """Wrap per-node confidences (NaN for unmapped nodes); values are copied."""
+        self._values = np.array(values, dtype=np.float64)
+        self._values.setflags(write=False)
+        self._len = int(np.count_nonzero(~np.isnan(self._values)))
+    
+    @classmethod
+    def from_dict(
+        cls,
+        oracle_map: Mapping[int, float],
+        num_nodes: Optional[int] = None
+    ) -> "DenseOracleMap":
+        """Build from a node_id -> confidence map.
+        
+        Args:
+            oracle_map: Map with non-negative integer node ids
+            num_nodes: Array size; defaults to the largest node id + 1
+            
+        Returns:
+            Dense map with the same entries
+            
+        Raises:
+            ValueError: If a node id is negative.
+        """
+        if num_nodes is None:
+            num_nodes = max(oracle_map) + 1 if oracle_map else 0
+        values = np.full(num_nodes, np.nan)
+        if oracle_map:
+            node_ids = np.fromiter(oracle_map.keys(), dtype=np.int64, count=len(oracle_map))
+            if node_ids.min() < 0:
+                raise ValueError("DenseOracleMap node ids must be non-negative")
+            values[node_ids] = np.fromiter(oracle_map.values(), dtype=np.float64, count=len(oracle_map))
+        return cls(values)
+    
+    def __getitem__(self, node_id: int) -> float:
+        value = self._lookup(node_id)
+        if value != value:  # NaN marks an unmapped node
+            raise KeyError(node_id)
+        return value
+    
+    def __contains__(self, node_id: object) -> bool:
+        value = self._lookup(node_id)
+        return value == value
+    
+    def _lookup(self, node_id: object) -> float:
+        """Return the slot for node_id as a Python float (NaN if out of range)."""
+        if type(node_id) is not int and not isinstance(node_id, np.integer):
+            return np.nan
+        if node_id < 0:
+            return np.nan
+        try:
+            return self._values.item(node_id)
+        except IndexError:
+            return np.nan
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero(~np.isnan(self._values)).tolist())
+    
+    def __len__(self) -> int:
+        return self._len
+
+
+# Read-only view over NODE_ORACLE_MAP; re-created when the global is rebound
+_ORACLE_VIEW: Mapping[int, float] = MappingProxyType(NODE_ORACLE_MAP)
+_ORACLE_SOURCE: Dict[int, float] = NODE_ORACLE_MAP
+
+
+def get_node_oracle_map_view() -> Mapping[int, float]:
+    """Get a read-only view of the node oracle map.
+    
+    For internal read paths that would otherwise copy the map on every call.
+    The view reflects in-place changes to NODE_ORACLE_MAP and follows it when
+    the global is rebound; use get_node_oracle_map() for an owned copy.
+    
+    Returns:
+        Read-only mapping of node_id to confidence (0.0 to 1.0)
+    """
+    global _ORACLE_VIEW, _ORACLE_SOURCE
+    if _ORACLE_SOURCE is not NODE_ORACLE_MAP:
+        _ORACLE_SOURCE = NODE_ORACLE_MAP
+        _ORACLE_VIEW = MappingProxyType(NODE_ORACLE_MAP)
+    return _ORACLE_VIEW
 
 
+@lru_cache(maxsize=512)
 def normalize_goal_text(goal_text: str) -> str:
     """Normalize goal text for consistent lookup.
     
     Applies lowercase, strip, and collapses multiple whitespace to single space.
+    Results are memoized since the same goal is normalized on every tick.
     
     Args:
         goal_text: Raw goal text string
@@ -50,23 +156,125 @@ def normalize_goal_text(goal_text: str) -> str:
     # TWEAK 4: Handle None/empty strings safely
     if not goal_text:
         return ""
-    return " ".join(goal_text.lower().strip().split())
+    text = goal_text.lower()
+    # Fast path: already single-spaced with no other whitespace. isprintable()
+    # rejects tabs/newlines and non-ASCII spaces that split() would collapse.
+    if text.isprintable() and "  " not in text and text[0] != " " and text[-1] != " ":
+        return text
+    return " ".join(text.split())
+
+
+# Read-only view over NODE_ORACLE_RELPOSE_MAP, rebuilt by refresh_relpose_map()
+_RELPOSE_VIEW: Mapping[str, Mapping[int, Mapping[str, float]]] = MappingProxyType({})
+_RELPOSE_SOURCE: Optional[Dict[str, Dict[int, Dict[str, float]]]] = None
+_FLAT_RELPOSE: Mapping[Tuple[str, int], RelposeEntry] = MappingProxyType({})
+
+
+def flatten_relpose_map(
+    relpose_map: Mapping[str, Mapping[int, Mapping[str, float]]]
+) -> Dict[Tuple[str, int], RelposeEntry]:
+    """Flatten a nested relpose map to (goal_key, node_id) -> entry tuples.
+    
+    Empty node entries are dropped, matching how the nested lookup treats
+    them as unmapped. Malformed entries (a goal or node value that is not a
+    mapping) are skipped one at a time so they cannot break lookups for the
+    rest of the map; check_visibility() falls back to the nested map on a
+    miss and reports them there.
+    
+    Args:
+        relpose_map: Nested map of goal_key -> node_id -> relpose dict
+        
+    Returns:
+        Dict mapping (goal_key, node_id) to (distance_m, bearing_rad, confidence)
+    """
+    flat: Dict[Tuple[str, int], RelposeEntry] = {}
+    for goal_key, nodes in relpose_map.items():
+        if not isinstance(nodes, Mapping):
+            continue
+        for node_id, data in nodes.items():
+            if not data or not isinstance(data, Mapping):
+                continue
+            flat[(goal_key, node_id)] = (
+                data.get("distance_m"),
+                data.get("bearing_rad"),
+                data.get("confidence")
+            )
+    return flat
 
 
-def get_node_oracle_relpose_map() -> Dict[str, Dict[int, Dict[str, float]]]:
-    """Get a deep copy of the relpose oracle map to prevent accidental mutation.
+def refresh_relpose_map() -> Mapping[str, Mapping[int, Mapping[str, float]]]:
+    """Rebuild the read-only relpose views from NODE_ORACLE_RELPOSE_MAP.
     
-    Returns a nested copy where both goal-level and node-level dicts are copied.
+    Call this after mutating NODE_ORACLE_RELPOSE_MAP in place. Rebinding
+    the module global is picked up automatically by
+    get_node_oracle_relpose_map() and get_flat_relpose(). The cached views
+    are only replaced once both have been built.
     
     Returns:
-        Deep copy of NODE_ORACLE_RELPOSE_MAP
+        The rebuilt nested read-only view
     """
-    # FIX C: Deep copy for nested dicts
-    return {
-        goal_key: {
-            node_id: data.copy()
+    global _RELPOSE_VIEW, _RELPOSE_SOURCE, _FLAT_RELPOSE
+    source = NODE_ORACLE_RELPOSE_MAP
+    flat = MappingProxyType(flatten_relpose_map(source))
+    view = MappingProxyType({
+        goal_key: MappingProxyType({
+            node_id: MappingProxyType(data) if isinstance(data, Mapping) else data
             for node_id, data in nodes.items()
-        }
-        for goal_key, nodes in NODE_ORACLE_RELPOSE_MAP.items()
-    }
+        }) if isinstance(nodes, Mapping) else nodes
+        for goal_key, nodes in source.items()
+    })
+    _RELPOSE_SOURCE, _FLAT_RELPOSE, _RELPOSE_VIEW = source, flat, view
+    return _RELPOSE_VIEW
+
+
+def set_relpose_map(
+    relpose_map: Mapping[str, Mapping[int, Mapping[str, float]]]
+) -> Mapping[str, Mapping[int, Mapping[str, float]]]:
+    """Install a relpose oracle map with its goal keys pre-normalized.
+    
+    Keys go through normalize_goal_text() once here, so a hand-written key
+    such as "Find the  Red Backpack" matches the normalized goal that
+    check_visibility() looks up. Node entries of keys that normalize to
+    the same goal are merged, later keys winning.
+    
+    Args:
+        relpose_map: Nested map of goal text -> node_id -> relpose dict
+        
+    Returns:
+        The rebuilt nested read-only view
+    """
+    global NODE_ORACLE_RELPOSE_MAP
+    normalized: Dict[str, Dict[int, Dict[str, float]]] = {}
+    for goal_text, nodes in relpose_map.items():
+        normalized.setdefault(normalize_goal_text(goal_text), {}).update(nodes)
+    NODE_ORACLE_RELPOSE_MAP = normalized
+    return refresh_relpose_map()
 
+
+def get_node_oracle_relpose_map() -> Mapping[str, Mapping[int, Mapping[str, float]]]:
+    """Get a read-only view of the relpose oracle map.
+    
+    The view is shared across calls instead of being deep-copied each time;
+    any attempt to mutate it raises TypeError. It is rebuilt lazily when
+    NODE_ORACLE_RELPOSE_MAP is rebound to a different dict.
+    
+    Returns:
+        Nested read-only view of NODE_ORACLE_RELPOSE_MAP
+    """
+    if _RELPOSE_SOURCE is not NODE_ORACLE_RELPOSE_MAP:
+        return refresh_relpose_map()
+    return _RELPOSE_VIEW
+
+
+def get_flat_relpose() -> Mapping[Tuple[str, int], RelposeEntry]:
+    """Get a read-only flat view of the relpose oracle map.
+    
+    Keyed by (goal_key, node_id) so a lookup is a single dict probe.
+    Kept in sync with get_node_oracle_relpose_map().
+    
+    Returns:
+        Mapping of (goal_key, node_id) to (distance_m, bearing_rad, confidence)
+    """
+    if _RELPOSE_SOURCE is not NODE_ORACLE_RELPOSE_MAP:
+        refresh_relpose_map()
+    return _FLAT_RELPOSE
@@ -0,0 +1,59 @@
+"""Core types for perception results."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass(slots=True)
+class VisibilityResult:
+    """Result of a single visibility check.
+    
+    Slotted so field access is a fixed-offset load instead of a dict
+    lookup. Use as_dict() at the boundary where consumers expect the
+    VisibilityResult dict shape (with a nested "evidence" dict).
+    
+    Attributes:
+        backend: Perception backend used.
+        node_id: Node ID the check was made at (or None).
+        is_visible: Whether the target is visible.
+        confidence: Confidence in [0.0, 1.0].
+        latency_ms: Milliseconds taken by the check.
+        distance_m: Distance to target in meters (relpose only).
+        bearing_rad: Bearing to target in radians (relpose only).
+        target_goal_key: Normalized goal text (relpose only, debug).
+        reason: Short explanation (e.g., "oracle_hit").
+        extra: Additional evidence info.
+    """
+    backend: str
+    node_id: Optional[int]
+    is_visible: bool = False
+    confidence: float = 0.0
+    latency_ms: int = 0
+    distance_m: Optional[float] = None
+    bearing_rad: Optional[float] = None
+    target_goal_key: Optional[str] = None
+    reason: str = "not_checked"
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert to the VisibilityResult dict shape.
+        
+        Returns:
+            Dict with is_visible, confidence, backend, latency_ms,
+            distance_m, bearing_rad, target_goal_key and evidence
+            (reason, node_id, extra).
+        """
+        return {
+            "is_visible": self.is_visible,
+            "confidence": self.confidence,
+            "backend": self.backend,
+            "latency_ms": self.latency_ms,
+            "distance_m": self.distance_m,
+            "bearing_rad": self.bearing_rad,
+            "target_goal_key": self.target_goal_key,
+            "evidence": {
+                "reason": self.reason,
+                "node_id": self.node_id,
+                "extra": self.extra
+            }
+        }
@@ -0,0 +1,233 @@
+"""Generated VLM hypothesis validator. Do not edit.
+
+Regenerate with: python -m runtime.generate_validator
+"""
+
+SCHEMA_SHA256 = "fc49ac5fc9fe2380dfe658cff62cecab5f129cf0c4092df8ea8388dd543b159a"
+VERSION = "2.22.2"
+from decimal import Decimal
+
+
+class JsonSchemaValueException(ValueError):
+    """Validation failure (mirrors fastjsonschema.JsonSchemaValueException)."""
+
+    def __init__(self, message, value=None, name=None, definition=None, rule=None):
+        super().__init__(message)
+        self.message = message
+        self.value = value
+        self.name = name
+        self.definition = definition
+        self.rule = rule
+
+
+class JsonSchemaValuesException(ValueError):
+    """Collection of failures (mirrors fastjsonschema.JsonSchemaValuesException)."""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = errors
+
+
+NoneType = type(None)
+
+def validate(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'VLMHypothesis', 'type': 'object', 'additionalProperties': False, 'required': ['target_status', 'action', 'confidence', 'rationale'], 'properties': {'target_status': {'type': 'string', 'enum': ['visible', 'not_visible', 'ambiguous']}, 'action': {'type': 'string', 'enum': ['approach', 'explore', 'rotate', 'goto_node', 'ask_clarification', 'stop']}, 'confidence': {'type': 'number', 'minimum': 0.0, 'maximum': 1.0}, 'navigation_goal': {'type': 'object', 'additionalProperties': False, 'properties': {'type': {'type': 'string', 'enum': ['pose_relative', 'node_id']}, 'distance_meters': {'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, 'angle_degrees': {'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, 'standoff_distance': {'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, 'node_id': {'type': 'integer', 'minimum': 0}}}, 'constraints': {'type': 'array', 'items': {'type': 'string'}}, 'clarification_question': {'type': 'string', 'maxLength': 160}, 'rationale': {'type': 'string', 'maxLength': 240}}, 'allOf': [{'if': {'properties': {'action': {'const': 'goto_node'}}}, 'then': {'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'node_id'], 'properties': {'type': {'const': 'node_id'}}}}}}, {'if': {'properties': {'action': {'const': 'approach'}}}, 'then': {'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'distance_meters', 'angle_degrees', 'standoff_distance'], 'properties': {'type': {'const': 'pose_relative'}}}}}}, {'if': {'properties': {'action': {'const': 'ask_clarification'}}}, 'then': {'required': ['clarification_question']}}]}, rule='type')
+    try:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data_keys = set(data.keys())
+            if "action" in data_keys:
+                data_keys.remove("action")
+                data__action = data["action"]
+                if not (isinstance(data__action, str) and data__action == 'goto_node'):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".action must be same as const definition: goto_node", value=data__action, name="" + (name_prefix or "data") + ".action", definition={'const': 'goto_node'}, rule='const')
+    except (JsonSchemaValueException, JsonSchemaValuesException):
+        pass
+    else:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['navigation_goal']) - data.keys()
+            if data__missing_keys:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'node_id'], 'properties': {'type': {'const': 'node_id'}}}}}, rule='required')
+            data_keys = set(data.keys())
+            if "navigation_goal" in data_keys:
+                data_keys.remove("navigation_goal")
+                data__navigationgoal = data["navigation_goal"]
+                data__navigationgoal_is_dict = isinstance(data__navigationgoal, dict)
+                if data__navigationgoal_is_dict:
+                    data__navigationgoal__missing_keys = set(['type', 'node_id']) - data__navigationgoal.keys()
+                    if data__navigationgoal__missing_keys:
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal must contain " + (str(sorted(data__navigationgoal__missing_keys)) + " properties"), value=data__navigationgoal, name="" + (name_prefix or "data") + ".navigation_goal", definition={'required': ['type', 'node_id'], 'properties': {'type': {'const': 'node_id'}}}, rule='required')
+                    data__navigationgoal_keys = set(data__navigationgoal.keys())
+                    if "type" in data__navigationgoal_keys:
+                        data__navigationgoal_keys.remove("type")
+                        data__navigationgoal__type = data__navigationgoal["type"]
+                        if not (isinstance(data__navigationgoal__type, str) and data__navigationgoal__type == 'node_id'):
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.type must be same as const definition: node_id", value=data__navigationgoal__type, name="" + (name_prefix or "data") + ".navigation_goal.type", definition={'const': 'node_id'}, rule='const')
+    try:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data_keys = set(data.keys())
+            if "action" in data_keys:
+                data_keys.remove("action")
+                data__action = data["action"]
+                if not (isinstance(data__action, str) and data__action == 'approach'):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".action must be same as const definition: approach", value=data__action, name="" + (name_prefix or "data") + ".action", definition={'const': 'approach'}, rule='const')
+    except (JsonSchemaValueException, JsonSchemaValuesException):
+        pass
+    else:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['navigation_goal']) - data.keys()
+            if data__missing_keys:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'distance_meters', 'angle_degrees', 'standoff_distance'], 'properties': {'type': {'const': 'pose_relative'}}}}}, rule='required')
+            data_keys = set(data.keys())
+            if "navigation_goal" in data_keys:
+                data_keys.remove("navigation_goal")
+                data__navigationgoal = data["navigation_goal"]
+                data__navigationgoal_is_dict = isinstance(data__navigationgoal, dict)
+                if data__navigationgoal_is_dict:
+                    data__navigationgoal__missing_keys = set(['type', 'distance_meters', 'angle_degrees', 'standoff_distance']) - data__navigationgoal.keys()
+                    if data__navigationgoal__missing_keys:
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal must contain " + (str(sorted(data__navigationgoal__missing_keys)) + " properties"), value=data__navigationgoal, name="" + (name_prefix or "data") + ".navigation_goal", definition={'required': ['type', 'distance_meters', 'angle_degrees', 'standoff_distance'], 'properties': {'type': {'const': 'pose_relative'}}}, rule='required')
+                    data__navigationgoal_keys = set(data__navigationgoal.keys())
+                    if "type" in data__navigationgoal_keys:
+                        data__navigationgoal_keys.remove("type")
+                        data__navigationgoal__type = data__navigationgoal["type"]
+                        if not (isinstance(data__navigationgoal__type, str) and data__navigationgoal__type == 'pose_relative'):
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.type must be same as const definition: pose_relative", value=data__navigationgoal__type, name="" + (name_prefix or "data") + ".navigation_goal.type", definition={'const': 'pose_relative'}, rule='const')
+    try:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data_keys = set(data.keys())
+            if "action" in data_keys:
+                data_keys.remove("action")
+                data__action = data["action"]
+                if not (isinstance(data__action, str) and data__action == 'ask_clarification'):
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".action must be same as const definition: ask_clarification", value=data__action, name="" + (name_prefix or "data") + ".action", definition={'const': 'ask_clarification'}, rule='const')
+    except (JsonSchemaValueException, JsonSchemaValuesException):
+        pass
+    else:
+        data_is_dict = isinstance(data, dict)
+        if data_is_dict:
+            data__missing_keys = set(['clarification_question']) - data.keys()
+            if data__missing_keys:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'required': ['clarification_question']}, rule='required')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['target_status', 'action', 'confidence', 'rationale']) - data.keys()
+        if data__missing_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'VLMHypothesis', 'type': 'object', 'additionalProperties': False, 'required': ['target_status', 'action', 'confidence', 'rationale'], 'properties': {'target_status': {'type': 'string', 'enum': ['visible', 'not_visible', 'ambiguous']}, 'action': {'type': 'string', 'enum': ['approach', 'explore', 'rotate', 'goto_node', 'ask_clarification', 'stop']}, 'confidence': {'type': 'number', 'minimum': 0.0, 'maximum': 1.0}, 'navigation_goal': {'type': 'object', 'additionalProperties': False, 'properties': {'type': {'type': 'string', 'enum': ['pose_relative', 'node_id']}, 'distance_meters': {'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, 'angle_degrees': {'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, 'standoff_distance': {'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, 'node_id': {'type': 'integer', 'minimum': 0}}}, 'constraints': {'type': 'array', 'items': {'type': 'string'}}, 'clarification_question': {'type': 'string', 'maxLength': 160}, 'rationale': {'type': 'string', 'maxLength': 240}}, 'allOf': [{'if': {'properties': {'action': {'const': 'goto_node'}}}, 'then': {'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'node_id'], 'properties': {'type': {'const': 'node_id'}}}}}}, {'if': {'properties': {'action': {'const': 'approach'}}}, 'then': {'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'distance_meters', 'angle_degrees', 'standoff_distance'], 'properties': {'type': {'const': 'pose_relative'}}}}}}, {'if': {'properties': {'action': {'const': 'ask_clarification'}}}, 'then': {'required': ['clarification_question']}}]}, rule='required')
+        data_keys = set(data.keys())
+        if "target_status" in data_keys:
+            data_keys.remove("target_status")
+            data__targetstatus = data["target_status"]
+            if not isinstance(data__targetstatus, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".target_status must be string", value=data__targetstatus, name="" + (name_prefix or "data") + ".target_status", definition={'type': 'string', 'enum': ['visible', 'not_visible', 'ambiguous']}, rule='type')
+            if not (isinstance(data__targetstatus, str) and data__targetstatus == 'visible' or isinstance(data__targetstatus, str) and data__targetstatus == 'not_visible' or isinstance(data__targetstatus, str) and data__targetstatus == 'ambiguous'):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".target_status must be one of ['visible', 'not_visible', 'ambiguous']", value=data__targetstatus, name="" + (name_prefix or "data") + ".target_status", definition={'type': 'string', 'enum': ['visible', 'not_visible', 'ambiguous']}, rule='enum')
+        if "action" in data_keys:
+            data_keys.remove("action")
+            data__action = data["action"]
+            if not isinstance(data__action, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".action must be string", value=data__action, name="" + (name_prefix or "data") + ".action", definition={'type': 'string', 'enum': ['approach', 'explore', 'rotate', 'goto_node', 'ask_clarification', 'stop']}, rule='type')
+            if not (isinstance(data__action, str) and data__action == 'approach' or isinstance(data__action, str) and data__action == 'explore' or isinstance(data__action, str) and data__action == 'rotate' or isinstance(data__action, str) and data__action == 'goto_node' or isinstance(data__action, str) and data__action == 'ask_clarification' or isinstance(data__action, str) and data__action == 'stop'):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".action must be one of ['approach', 'explore', 'rotate', 'goto_node', 'ask_clarification', 'stop']", value=data__action, name="" + (name_prefix or "data") + ".action", definition={'type': 'string', 'enum': ['approach', 'explore', 'rotate', 'goto_node', 'ask_clarification', 'stop']}, rule='enum')
+        if "confidence" in data_keys:
+            data_keys.remove("confidence")
+            data__confidence = data["confidence"]
+            if not isinstance(data__confidence, (int, float, Decimal)) or isinstance(data__confidence, bool):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".confidence must be number", value=data__confidence, name="" + (name_prefix or "data") + ".confidence", definition={'type': 'number', 'minimum': 0.0, 'maximum': 1.0}, rule='type')
+            if isinstance(data__confidence, (int, float, Decimal)):
+                if data__confidence < 0.0:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".confidence must be bigger than or equal to 0.0", value=data__confidence, name="" + (name_prefix or "data") + ".confidence", definition={'type': 'number', 'minimum': 0.0, 'maximum': 1.0}, rule='minimum')
+                if data__confidence > 1.0:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".confidence must be smaller than or equal to 1.0", value=data__confidence, name="" + (name_prefix or "data") + ".confidence", definition={'type': 'number', 'minimum': 0.0, 'maximum': 1.0}, rule='maximum')
+        if "navigation_goal" in data_keys:
+            data_keys.remove("navigation_goal")
+            data__navigationgoal = data["navigation_goal"]
+            if not isinstance(data__navigationgoal, (dict)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal must be object", value=data__navigationgoal, name="" + (name_prefix or "data") + ".navigation_goal", definition={'type': 'object', 'additionalProperties': False, 'properties': {'type': {'type': 'string', 'enum': ['pose_relative', 'node_id']}, 'distance_meters': {'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, 'angle_degrees': {'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, 'standoff_distance': {'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, 'node_id': {'type': 'integer', 'minimum': 0}}}, rule='type')
+            data__navigationgoal_is_dict = isinstance(data__navigationgoal, dict)
+            if data__navigationgoal_is_dict:
+                data__navigationgoal_keys = set(data__navigationgoal.keys())
+                if "type" in data__navigationgoal_keys:
+                    data__navigationgoal_keys.remove("type")
+                    data__navigationgoal__type = data__navigationgoal["type"]
+                    if not isinstance(data__navigationgoal__type, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.type must be string", value=data__navigationgoal__type, name="" + (name_prefix or "data") + ".navigation_goal.type", definition={'type': 'string', 'enum': ['pose_relative', 'node_id']}, rule='type')
+                    if not (isinstance(data__navigationgoal__type, str) and data__navigationgoal__type == 'pose_relative' or isinstance(data__navigationgoal__type, str) and data__navigationgoal__type == 'node_id'):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.type must be one of ['pose_relative', 'node_id']", value=data__navigationgoal__type, name="" + (name_prefix or "data") + ".navigation_goal.type", definition={'type': 'string', 'enum': ['pose_relative', 'node_id']}, rule='enum')
+                if "distance_meters" in data__navigationgoal_keys:
+                    data__navigationgoal_keys.remove("distance_meters")
+                    data__navigationgoal__distancemeters = data__navigationgoal["distance_meters"]
+                    if not isinstance(data__navigationgoal__distancemeters, (int, float, Decimal)) or isinstance(data__navigationgoal__distancemeters, bool):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.distance_meters must be number", value=data__navigationgoal__distancemeters, name="" + (name_prefix or "data") + ".navigation_goal.distance_meters", definition={'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, rule='type')
+                    if isinstance(data__navigationgoal__distancemeters, (int, float, Decimal)):
+                        if data__navigationgoal__distancemeters < 0.0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.distance_meters must be bigger than or equal to 0.0", value=data__navigationgoal__distancemeters, name="" + (name_prefix or "data") + ".navigation_goal.distance_meters", definition={'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, rule='minimum')
+                        if data__navigationgoal__distancemeters > 10.0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.distance_meters must be smaller than or equal to 10.0", value=data__navigationgoal__distancemeters, name="" + (name_prefix or "data") + ".navigation_goal.distance_meters", definition={'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, rule='maximum')
+                if "angle_degrees" in data__navigationgoal_keys:
+                    data__navigationgoal_keys.remove("angle_degrees")
+                    data__navigationgoal__angledegrees = data__navigationgoal["angle_degrees"]
+                    if not isinstance(data__navigationgoal__angledegrees, (int, float, Decimal)) or isinstance(data__navigationgoal__angledegrees, bool):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.angle_degrees must be number", value=data__navigationgoal__angledegrees, name="" + (name_prefix or "data") + ".navigation_goal.angle_degrees", definition={'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, rule='type')
+                    if isinstance(data__navigationgoal__angledegrees, (int, float, Decimal)):
+                        if data__navigationgoal__angledegrees < -180.0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.angle_degrees must be bigger than or equal to -180.0", value=data__navigationgoal__angledegrees, name="" + (name_prefix or "data") + ".navigation_goal.angle_degrees", definition={'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, rule='minimum')
+                        if data__navigationgoal__angledegrees > 180.0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.angle_degrees must be smaller than or equal to 180.0", value=data__navigationgoal__angledegrees, name="" + (name_prefix or "data") + ".navigation_goal.angle_degrees", definition={'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, rule='maximum')
+                if "standoff_distance" in data__navigationgoal_keys:
+                    data__navigationgoal_keys.remove("standoff_distance")
+                    data__navigationgoal__standoffdistance = data__navigationgoal["standoff_distance"]
+                    if not isinstance(data__navigationgoal__standoffdistance, (int, float, Decimal)) or isinstance(data__navigationgoal__standoffdistance, bool):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.standoff_distance must be number", value=data__navigationgoal__standoffdistance, name="" + (name_prefix or "data") + ".navigation_goal.standoff_distance", definition={'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, rule='type')
+                    if isinstance(data__navigationgoal__standoffdistance, (int, float, Decimal)):
+                        if data__navigationgoal__standoffdistance < 0.0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.standoff_distance must be bigger than or equal to 0.0", value=data__navigationgoal__standoffdistance, name="" + (name_prefix or "data") + ".navigation_goal.standoff_distance", definition={'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, rule='minimum')
+                        if data__navigationgoal__standoffdistance > 5.0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.standoff_distance must be smaller than or equal to 5.0", value=data__navigationgoal__standoffdistance, name="" + (name_prefix or "data") + ".navigation_goal.standoff_distance", definition={'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, rule='maximum')
+                if "node_id" in data__navigationgoal_keys:
+                    data__navigationgoal_keys.remove("node_id")
+                    data__navigationgoal__nodeid = data__navigationgoal["node_id"]
+                    if not isinstance(data__navigationgoal__nodeid, (int)) and not (isinstance(data__navigationgoal__nodeid, float) and data__navigationgoal__nodeid.is_integer()) or isinstance(data__navigationgoal__nodeid, bool):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.node_id must be integer", value=data__navigationgoal__nodeid, name="" + (name_prefix or "data") + ".navigation_goal.node_id", definition={'type': 'integer', 'minimum': 0}, rule='type')
+                    if isinstance(data__navigationgoal__nodeid, (int, float, Decimal)):
+                        if data__navigationgoal__nodeid < 0:
+                            raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal.node_id must be bigger than or equal to 0", value=data__navigationgoal__nodeid, name="" + (name_prefix or "data") + ".navigation_goal.node_id", definition={'type': 'integer', 'minimum': 0}, rule='minimum')
+                if data__navigationgoal_keys:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".navigation_goal must not contain "+str(data__navigationgoal_keys)+" properties", value=data__navigationgoal, name="" + (name_prefix or "data") + ".navigation_goal", definition={'type': 'object', 'additionalProperties': False, 'properties': {'type': {'type': 'string', 'enum': ['pose_relative', 'node_id']}, 'distance_meters': {'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, 'angle_degrees': {'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, 'standoff_distance': {'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, 'node_id': {'type': 'integer', 'minimum': 0}}}, rule='additionalProperties')
+        if "constraints" in data_keys:
+            data_keys.remove("constraints")
+            data__constraints = data["constraints"]
+            if not isinstance(data__constraints, (list, tuple)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".constraints must be array", value=data__constraints, name="" + (name_prefix or "data") + ".constraints", definition={'type': 'array', 'items': {'type': 'string'}}, rule='type')
+            data__constraints_is_list = isinstance(data__constraints, (list, tuple))
+            if data__constraints_is_list:
+                data__constraints_len = len(data__constraints)
+                for data__constraints_x, data__constraints_item in enumerate(data__constraints):
+                    if not isinstance(data__constraints_item, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".constraints[{data__constraints_x}]".format(**locals()) + " must be string", value=data__constraints_item, name="" + (name_prefix or "data") + ".constraints[{data__constraints_x}]".format(**locals()) + "", definition={'type': 'string'}, rule='type')
+        if "clarification_question" in data_keys:
+            data_keys.remove("clarification_question")
+            data__clarificationquestion = data["clarification_question"]
+            if not isinstance(data__clarificationquestion, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".clarification_question must be string", value=data__clarificationquestion, name="" + (name_prefix or "data") + ".clarification_question", definition={'type': 'string', 'maxLength': 160}, rule='type')
+            if isinstance(data__clarificationquestion, str):
+                data__clarificationquestion_len = len(data__clarificationquestion)
+                if data__clarificationquestion_len > 160:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".clarification_question must be shorter than or equal to 160 characters", value=data__clarificationquestion, name="" + (name_prefix or "data") + ".clarification_question", definition={'type': 'string', 'maxLength': 160}, rule='maxLength')
+        if "rationale" in data_keys:
+            data_keys.remove("rationale")
+            data__rationale = data["rationale"]
+            if not isinstance(data__rationale, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".rationale must be string", value=data__rationale, name="" + (name_prefix or "data") + ".rationale", definition={'type': 'string', 'maxLength': 240}, rule='type')
+            if isinstance(data__rationale, str):
+                data__rationale_len = len(data__rationale)
+                if data__rationale_len > 240:
+                    raise JsonSchemaValueException("" + (name_prefix or "data") + ".rationale must be shorter than or equal to 240 characters", value=data__rationale, name="" + (name_prefix or "data") + ".rationale", definition={'type': 'string', 'maxLength': 240}, rule='maxLength')
+        if data_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must not contain "+str(data_keys)+" properties", value=data, name="" + (name_prefix or "data") + "", definition={'$schema': 'http://json-schema.org/draft-07/schema#', 'title': 'VLMHypothesis', 'type': 'object', 'additionalProperties': False, 'required': ['target_status', 'action', 'confidence', 'rationale'], 'properties': {'target_status': {'type': 'string', 'enum': ['visible', 'not_visible', 'ambiguous']}, 'action': {'type': 'string', 'enum': ['approach', 'explore', 'rotate', 'goto_node', 'ask_clarification', 'stop']}, 'confidence': {'type': 'number', 'minimum': 0.0, 'maximum': 1.0}, 'navigation_goal': {'type': 'object', 'additionalProperties': False, 'properties': {'type': {'type': 'string', 'enum': ['pose_relative', 'node_id']}, 'distance_meters': {'type': 'number', 'minimum': 0.0, 'maximum': 10.0}, 'angle_degrees': {'type': 'number', 'minimum': -180.0, 'maximum': 180.0}, 'standoff_distance': {'type': 'number', 'minimum': 0.0, 'maximum': 5.0}, 'node_id': {'type': 'integer', 'minimum': 0}}}, 'constraints': {'type': 'array', 'items': {'type': 'string'}}, 'clarification_question': {'type': 'string', 'maxLength': 160}, 'rationale': {'type': 'string', 'maxLength': 240}}, 'allOf': [{'if': {'properties': {'action': {'const': 'goto_node'}}}, 'then': {'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'node_id'], 'properties': {'type': {'const': 'node_id'}}}}}}, {'if': {'properties': {'action': {'const': 'approach'}}}, 'then': {'required': ['navigation_goal'], 'properties': {'navigation_goal': {'required': ['type', 'distance_meters', 'angle_degrees', 'standoff_distance'], 'properties': {'type': {'const': 'pose_relative'}}}}}}, {'if': {'properties': {'action': {'const': 'ask_clarification'}}}, 'then': {'required': ['clarification_question']}}]}, rule='additionalProperties')
+    return data
\ No newline at end of file
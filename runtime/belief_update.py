@@ -0,0 +1,231 @@
+"""Belief state update rules applied once per runtime loop step.
+
+Extracted from runtime/loop.py so the per-step update is a plain function
+call (and a self-contained unit for testing or compiling).
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from runtime.types import BeliefState
+
+
+# Perception constants
+CLOSE_ENOUGH_M = 0.75  # Distance threshold for done transition (meters)
+VISIBILITY_HYSTERESIS_K = 2  # Consecutive visible hits required for "visible"
+
+
+def compute_close_enough(
+    belief: Union[Dict[str, Any], BeliefState],
+    vr: Dict[str, Any],
+    step_id: int,
+    close_enough_m: float,
+    backend: str
+) -> bool:
+    """Compute close_enough predicate for done gating.
+    
+    The done transition requires multiple conditions (visible status, approach action,
+    perception visible, close_enough). This function computes the close_enough component.
+    
+    Policy:
+    - Always requires visible_since_step guard (step_id > visible_since_step)
+    - node_oracle_relpose backend: requires distance_m <= close_enough_m
+    - node_oracle backend: uses node-based check (current == last_seen)
+    - Unknown backend or missing data: returns False (safe default)
+    
+    Args:
+        belief: Current belief state (dict or BeliefState)
+        vr: Visibility result from check_visibility()
+        step_id: Current step ID
+        close_enough_m: Distance threshold in meters
+        backend: Perception backend identifier (must be "node_oracle_relpose" or "node_oracle")
+        
+    Returns:
+        True if close enough for done transition, False otherwise
+    """
+    # Guard: prevent immediate done on same step as visible
+    visible_since = belief.get("visible_since_step")
+    if visible_since is None or step_id <= visible_since:
+        return False
+    
+    # Backend-specific logic (FIX F: explicit policy)
+    if backend == "node_oracle_relpose":
+        # Relpose backend: REQUIRE distance_m
+        distance_m = vr.get("distance_m")
+        if distance_m is not None:
+            # TWEAK 5: Type safety for distance comparison
+            try:
+                distance = float(distance_m)
+                return distance <= close_enough_m
+            except (TypeError, ValueError):
+                return False  # Invalid distance type → safe default
+        else:
+            return False  # Missing distance on relpose backend → not close
+    elif backend == "node_oracle":
+        # Classic backend: node-based check for backward compatibility
+        current_node = belief.get("current_node_id")
+        last_seen_node = belief.get("last_seen_node_id")
+        return (current_node is not None 
+                and current_node == last_seen_node)
+    else:
+        # Unknown backend → safe default
+        return False
+
+
+def _simulate_goto_node(belief: BeliefState) -> None:
+    """Move current_node_id to the node targeted by last_vlm_hypothesis."""
+    # Works for both VLM and fallback hypotheses
+    navigation_goal = belief.last_vlm_hypothesis.get("navigation_goal")
+    if navigation_goal is None:
+        return
+    target_node_id = navigation_goal.get("node_id")
+    if target_node_id is not None:
+        belief.current_node_id = target_node_id
+
+
+def _simulate_noop(belief: BeliefState) -> None:
+    """Actions that do not change current_node_id."""
+
+
+# Action name -> simulated execution. approach, explore, rotate, stop and
+# ask_clarification don't change current_node_id, so they fall through to
+# _simulate_noop.
+_ACTION_HANDLERS: Dict[str, Callable[[BeliefState], None]] = {
+    "goto_node": _simulate_goto_node,
+}
+
+
+@lru_cache(maxsize=128)
+def _vlm_outcome(
+    valid: bool,
+    ok: bool,
+    action: Optional[str],
+    reason_code: Optional[str],
+    parse_failed: bool
+) -> Tuple[Optional[str], str]:
+    """Map a VLM/verifier outcome to (rejection_reason, next_action).
+    
+    Pure function of a handful of small enums, memoized so repeated
+    outcomes are a table lookup.
+    
+    Args:
+        valid: Whether the hypothesis passed schema validation.
+        ok: Whether the verifier accepted the hypothesis.
+        action: Hypothesis action (valid hypotheses only).
+        reason_code: Verifier reason_code when not ok (valid hypotheses only).
+        parse_failed: Whether the VLM output failed JSON parsing.
+        
+    Returns:
+        Tuple of (rejection_reason, next_action).
+    """
+    if valid and ok:
+        return None, action
+    if not valid:
+        return ("VLM_INVALID:json_parse" if parse_failed else "VLM_INVALID:schema"), "explore"
+    return reason_code, "explore"
+
+
+def apply_vlm_decision(
+    belief: BeliefState,
+    vlm_validated: Optional[Dict[str, Any]],
+    verifier_result: Dict[str, Any],
+    validation_error: Optional[Dict[str, Any]]
+) -> None:
+    """Apply the VLM/verifier outcome to belief state (mutates in-place).
+    
+    Sets last_vlm_hypothesis, rejection_reason and next_action, then
+    simulates the chosen action (goto_node moves current_node_id). Never
+    changes target_status: only perception can promote to visible/done.
+    
+    Args:
+        belief: Current belief state (modified in-place).
+        vlm_validated: Schema-valid VLM hypothesis, or None.
+        verifier_result: Verifier result dictionary.
+        validation_error: meta["validation_error"] for this step, or None.
+    """
+    # 1) last_vlm_hypothesis (None when the hypothesis was invalid)
+    belief.last_vlm_hypothesis = vlm_validated
+    
+    # 2) target_status: VLM can NO LONGER set visible/done
+    # Only perception can promote to "visible" or "done"
+    # (this logic is now handled by perception visibility gate after action simulation)
+    # Keep current target_status (no auto-demotion)
+    
+    # 3) rejection_reason and 4) next_action, looked up from the outcome
+    ok = bool(verifier_result.get("ok", False))
+    if vlm_validated is None:
+        parse_failed = bool(validation_error) and validation_error.get("type") == "json_parse"
+        belief.rejection_reason, belief.next_action = _vlm_outcome(False, ok, None, None, parse_failed)
+    else:
+        reason_code = None if ok else verifier_result.get("reason_code", "UNKNOWN")
+        belief.rejection_reason, belief.next_action = _vlm_outcome(
+            True, ok, vlm_validated["action"], reason_code, False
+        )
+    
+    # 5) Simulate action execution (BEFORE perception check)
+    # Use final executed action (belief.next_action) so fallback-chosen actions are also simulated
+    _ACTION_HANDLERS.get(belief.next_action, _simulate_noop)(belief)
+
+
+def apply_perception_update(
+    belief: BeliefState,
+    vr: Dict[str, Any],
+    step_id: int,
+    k: int = VISIBILITY_HYSTERESIS_K,
+    close_enough_m: float = CLOSE_ENOUGH_M
+) -> Optional[str]:
+    """Apply a perception visibility result to belief state (mutates in-place).
+    
+    Perception is the ONLY authority that can set target_status to
+    "visible" or "done".
+    
+    Transition rules:
+    - searching/likely_in_memory -> visible: k consecutive visible hits
+    - visible -> done: approach action + perception visible + close_enough
+    
+    Args:
+        belief: Current belief state (modified in-place).
+        vr: Visibility result from check_visibility().
+        step_id: Current step ID.
+        k: Hysteresis threshold (consecutive hits required for visible).
+        close_enough_m: Distance threshold in meters for done.
+        
+    Returns:
+        Transition label (e.g. "searching->visible", "visible->done") or None.
+    """
+    # Update visibility fields
+    belief.last_visibility = vr
+    
+    # Update visibility streak (hysteresis mechanism)
+    if vr["is_visible"]:
+        belief.visibility_streak = belief.visibility_streak + 1
+    else:
+        belief.visibility_streak = 0
+    
+    # Track belief transitions for logging
+    belief_transition = None
+    old_status = belief.target_status
+    
+    # Transition 1: searching/likely_in_memory -> visible (requires K consecutive hits)
+    if belief.visibility_streak >= k and belief.target_status not in {"visible", "done"}:
+        belief.target_status = "visible"
+        belief.last_seen_node_id = belief.current_node_id
+        belief.visible_since_step = step_id
+        belief_transition = f"{old_status}->visible"
+    
+    # Transition 2: visible -> done (requires approach action + perception + close_enough)
+    if belief.target_status == "visible" and belief.next_action == "approach" and vr["is_visible"]:
+        # Use extracted helper for close_enough logic (FIX F, FIX H)
+        close_enough = compute_close_enough(
+            belief=belief,
+            vr=vr,
+            step_id=step_id,
+            close_enough_m=close_enough_m,
+            backend=vr["backend"]
+        )
+        
+        if close_enough:
+            belief.target_status = "done"
+            belief_transition = "visible->done"
+    
+    return belief_transition
@@ -0,0 +1,111 @@
+"""Generate runtime/_vlm_validator_gen.py from vlm_hypothesis.schema.json.
+
+The generated module is a plain-Python validate(data) function specialized
+to the VLM hypothesis schema (no schema traversal, no third-party imports).
+runtime/schema_loader.py uses it only while its SCHEMA_SHA256 matches the
+schema file, so a stale module is ignored rather than trusted.
+
+Requires fastjsonschema at generation time only. Usage:
+
+    python -m runtime.generate_validator          # regenerate if stale
+    python -m runtime.generate_validator --check  # exit 1 if stale
+"""
+
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+
+from runtime.schema_loader import load_validators
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema" / "vlm_hypothesis.schema.json"
+OUTPUT_PATH = Path(__file__).resolve().parent / "_vlm_validator_gen.py"
+
+_FASTJSONSCHEMA_IMPORT = "from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException"
+
+# Stand-ins for the fastjsonschema exceptions the generated code raises, so
+# the module has no runtime dependency (both subclass ValueError, as upstream)
+_LOCAL_EXCEPTIONS = '''class JsonSchemaValueException(ValueError):
+    """Validation failure (mirrors fastjsonschema.JsonSchemaValueException)."""
+
+    def __init__(self, message, value=None, name=None, definition=None, rule=None):
+        super().__init__(message)
+        self.message = message
+        self.value = value
+        self.name = name
+        self.definition = definition
+        self.rule = rule
+
+
+class JsonSchemaValuesException(ValueError):
+    """Collection of failures (mirrors fastjsonschema.JsonSchemaValuesException)."""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = errors'''
+
+
+def schema_sha256(path: Path = SCHEMA_PATH) -> str:
+    """Return the SHA-256 hex digest of a schema file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def is_current(output_path: Path = OUTPUT_PATH) -> bool:
+    """Return True if output_path was generated from the current schema."""
+    if not output_path.exists():
+        return False
+    expected = f'SCHEMA_SHA256 = "{schema_sha256()}"'
+    return expected in output_path.read_text(encoding="utf-8").splitlines()
+
+
+def generate_source() -> str:
+    """Generate the validator module source for the current schema.
+
+    Returns:
+        Python source of the generated module.
+
+    Raises:
+        RuntimeError: If fastjsonschema is not installed.
+    """
+    try:
+        import fastjsonschema
+    except ImportError as e:
+        raise RuntimeError("fastjsonschema is required to generate the validator") from e
+
+    # Validator schemas have their $refs inlined (see schema_loader)
+    schema = load_validators().vlm_validator.schema
+    code = fastjsonschema.compile_to_code(schema, use_default=False, use_formats=False)
+    if _FASTJSONSCHEMA_IMPORT not in code:
+        raise RuntimeError("Unexpected fastjsonschema output; update generate_validator.py")
+    code = code.replace(_FASTJSONSCHEMA_IMPORT, "\n\n" + _LOCAL_EXCEPTIONS)
+
+    header = (
+        '"""Generated VLM hypothesis validator. Do not edit.\n'
+        "\n"
+        "Regenerate with: python -m runtime.generate_validator\n"
+        '"""\n'
+        "\n"
+        f'SCHEMA_SHA256 = "{schema_sha256()}"\n'
+    )
+    return header + code
+
+
+def main() -> None:
+    """Regenerate the validator module if stale (or only check with --check)."""
+    parser = argparse.ArgumentParser(description="Generate the VLM hypothesis validator module")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the generated module is stale")
+    args = parser.parse_args()
+
+    if is_current():
+        print(f"{OUTPUT_PATH.name} is up to date")
+        return
+    if args.check:
+        print(f"{OUTPUT_PATH.name} is stale; run python -m runtime.generate_validator")
+        sys.exit(1)
+
+    OUTPUT_PATH.write_text(generate_source(), encoding="utf-8")
+    print(f"Wrote {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
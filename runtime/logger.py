@@ -1,27 +1,120 @@
 """Decision logger for runtime loop steps."""
 
+import atexit
 import json
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    # Optional: fast C JSON encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson options: int dict keys (e.g. node IDs) are allowed like json.dumps,
+# and datetimes go through _default so they render as str(obj) like before.
+# Log lines additionally get their trailing newline from the encoder itself.
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+)
+_ORJSON_LINE_OPTIONS = (
+    _ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE if orjson is not None else 0
+)
+
+
+def _default(obj: Any) -> Any:
+    """Encoder fallback for types JSON does not handle natively.
+    
+    Converts Path objects and datetime objects to strings.
+    
+    Args:
+        obj: Object the encoder could not serialize.
+        
+    Returns:
+        JSON-serializable representation of the object.
+        
+    Raises:
+        TypeError: If obj has no JSON representation.
+    """
+    if isinstance(obj, (Path, datetime)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_json(obj: Any) -> bytes:
+    """Encode a value to JSON bytes exactly as log_step would embed it.
+    
+    Use this to snapshot a value that is about to be mutated (e.g. the
+    belief state before a step) and pass the bytes to log_step instead of
+    a deep copy.
+    
+    Args:
+        obj: JSON-serializable value (Path/datetime allowed).
+        
+    Returns:
+        UTF-8 JSON bytes without a trailing newline.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+# Whole-second timestamp prefix, reformatted only when the second changes
+_ts_second: int = -1
+_ts_prefix: str = ""
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO-8601 string with a "Z" suffix.
+    
+    Always carries microseconds, e.g. "2024-01-01T12:00:00.000000Z".
+    
+    Returns:
+        ISO-8601 timestamp string.
+    """
+    global _ts_second, _ts_prefix
+    
+    ns = time.time_ns()
+    second, remainder_ns = divmod(ns, 1_000_000_000)
+    if second != _ts_second:
+        _ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_second = second
+    return f"{_ts_prefix}.{remainder_ns // 1000:06d}Z"
 
 
 class DecisionLogger:
-    """Logger that writes decision steps to JSONL file."""
+    """Logger that writes decision steps to JSONL file.
+    
+    Encoded lines are batched in memory and written as one payload every
+    flush_every steps, on flush()/close(), and at interpreter exit; close()
+    also fsyncs the file. Use as a context manager
+    (with DecisionLogger() as logger: ...) to close it deterministically.
+    """
     
-    def __init__(self) -> None:
-        """Initialize logger and create logs directory if needed."""
+    def __init__(self, flush_every: int = 32) -> None:
+        """Initialize logger and create logs directory if needed.
+        
+        Args:
+            flush_every: Write batched lines after this many steps (<= 0
+                writes only on flush()/close()/exit).
+        """
         logs_dir = Path("logs")
         logs_dir.mkdir(exist_ok=True)
         
         self._log_file = logs_dir / "decisions.jsonl"
-        self._file = open(self._log_file, "a", encoding="utf-8")
+        self._file = open(self._log_file, "ab")
+        self._flush_every = flush_every
+        # Encoded lines not yet written to the file
+        self._pending: List[bytes] = []
+        atexit.register(self.close)
     
     def log_step(
         self,
         step_id: int,
-        belief_before: Dict[str, Any],
+        belief_before: Union[Dict[str, Any], bytes],
         vlm_raw: Any,
         vlm_validated: Optional[Dict[str, Any]],
         verifier_result: Dict[str, Any],
@@ -32,7 +125,8 @@ class DecisionLogger:
         
         Args:
             step_id: Step identifier.
-            belief_before: Belief state before this step.
+            belief_before: Belief state before this step, as a dict or as
+                bytes from encode_json() (embedded without re-encoding).
             vlm_raw: Raw VLM output (string or dict).
             vlm_validated: Validated VLM hypothesis dict or None.
             verifier_result: Verifier result dictionary.
@@ -40,43 +134,53 @@ class DecisionLogger:
             meta: Metadata dictionary with latencies and validation_error if any.
         """
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_timestamp(),
             "step_id": step_id,
             "event_type": "STEP",
-            "belief_before": self._serialize(belief_before),
-            "vlm_raw": self._serialize(vlm_raw),
-            "vlm_validated": self._serialize(vlm_validated),
-            "verifier_result": self._serialize(verifier_result),
-            "belief_after": self._serialize(belief_after),
-            "meta": self._serialize(meta)
+            "vlm_raw": vlm_raw,
+            "vlm_validated": vlm_validated,
+            "verifier_result": verifier_result,
+            "belief_after": belief_after,
+            "meta": meta
         }
+        if isinstance(belief_before, bytes):
+            before_json = belief_before
+        else:
+            before_json = encode_json(belief_before)
         
-        json_line = json.dumps(log_entry, ensure_ascii=False)
-        self._file.write(json_line + "\n")
-        self._file.flush()
-    
-    def _serialize(self, obj: Any) -> Any:
-        """Serialize object to JSON-serializable format.
+        # The encoder walks the tree natively; Path/datetime are coerced by
+        # _default only when encountered. Each line carries its own newline.
+        if orjson is not None:
+            json_line = orjson.dumps(log_entry, default=_default, option=_ORJSON_LINE_OPTIONS)
+        else:
+            json_line = (json.dumps(log_entry, ensure_ascii=False, default=_default) + "\n").encode("utf-8")
         
-        Converts Path objects and datetime objects to strings.
+        # Splice the pre-encoded belief_before in as the first member
+        self._pending.append(b'{"belief_before":' + before_json + b"," + json_line[1:])
         
-        Args:
-            obj: Object to serialize.
-            
-        Returns:
-            JSON-serializable representation of the object.
-        """
-        if isinstance(obj, (Path, datetime)):
-            return str(obj)
-        elif isinstance(obj, dict):
-            return {k: self._serialize(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._serialize(item) for item in obj]
-        else:
-            return obj
+        if self._flush_every > 0 and len(self._pending) >= self._flush_every:
+            self.flush()
     
-    def __del__(self) -> None:
-        """Close file on deletion."""
-        if hasattr(self, "_file") and self._file:
+    def flush(self) -> None:
+        """Write batched log lines to the file as one payload."""
+        if self._file.closed:
+            return
+        if self._pending:
+            self._file.write(b"".join(self._pending))
+            self._pending.clear()
+        self._file.flush()
+    
+    def close(self) -> None:
+        """Flush, fsync and close the log file (safe to call more than once)."""
+        if hasattr(self, "_file") and not self._file.closed:
+            self.flush()
+            os.fsync(self._file.fileno())
             self._file.close()
+        atexit.unregister(self.close)
+    
+    def __enter__(self) -> "DecisionLogger":
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
 
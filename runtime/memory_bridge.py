@@ -3,6 +3,11 @@
 from typing import Any, Dict
 
 
+# Statuses retrieval may promote to likely_in_memory; every other status
+# (visible, done, unreachable, likely_in_memory) is left unchanged
+_PROMOTABLE_STATUSES = frozenset({"searching"})
+
+
 def apply_memory_retrieval(
     belief: Dict[str, Any],
     candidates: list[dict],
@@ -25,27 +30,14 @@ def apply_memory_retrieval(
         candidates: List of retrieved candidates with node_id and score.
         threshold: Score threshold for promotion to "likely_in_memory".
     """
-    # Always update candidate_nodes (even if empty) for schema safety
-    belief["candidate_nodes"] = candidates
+    # Always update candidate_nodes (even if empty) for schema safety;
+    # skip the store when the cached retrieval list is already in place
+    if belief.get("candidate_nodes") is not candidates:
+        belief["candidate_nodes"] = candidates
     
-    # Get current status
+    # Promote searching to likely_in_memory if we have strong candidates.
+    # visible/done/unreachable are never changed by retrieval, and
+    # likely_in_memory is NOT demoted to searching (no flapping)
     current_status = belief.get("target_status", "searching")
-    
-    # Apply status transition rules
-    if current_status == "visible":
-        # NEVER change visible status due to retrieval
-        pass
-    elif current_status in ["done", "unreachable"]:
-        # NEVER change terminal states due to retrieval
-        pass
-    elif current_status == "likely_in_memory":
-        # Do NOT demote to searching (no flapping)
-        # Keep status as-is
-        pass
-    elif current_status == "searching":
-        # Promote to likely_in_memory if we have strong candidates
-        if candidates and candidates[0]["score"] >= threshold:
-            belief["target_status"] = "likely_in_memory"
-        # Otherwise remain searching
-    # else: keep current status for any other states
-
+    if current_status in _PROMOTABLE_STATUSES and candidates and candidates[0]["score"] >= threshold:
+        belief["target_status"] = "likely_in_memory"
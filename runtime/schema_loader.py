@@ -1,34 +1,142 @@
 """Schema loading and validation for VLM hypothesis.
 
-Provides Windows-safe schema loading with $ref resolution.
-Extracted from runtime/loop.py to avoid circular imports.
+Provides Windows-safe schema loading with $ref resolution (refs are
+inlined at load time). Extracted from runtime/loop.py to avoid circular
+imports.
 """
 
+import hashlib
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin
 
-from jsonschema import Draft7Validator, RefResolver
+from jsonschema import Draft7Validator
 
+try:
+    # Optional: fast C JSON parser
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_hypothesis_validator() -> Draft7Validator:
-    """Load VLM hypothesis validator with Windows-compatible $ref resolution.
+try:
+    # Pre-generated VLM hypothesis check (python -m runtime.generate_validator);
+    # used only while its SCHEMA_SHA256 matches the schema file
+    from runtime import _vlm_validator_gen
+except ImportError:
+    _vlm_validator_gen = None
+
+
+class _CompiledCheck(NamedTuple):
+    """Compiled check registered for one validator.
     
+    Holding the validator keeps its id() from being reused while the entry
+    exists, and lookups also compare it by identity.
+    """
+    validator: Draft7Validator
+    check: Callable[[Any], Any]
+
+
+# id(Draft7Validator) -> compiled check for the same schema (raises a
+# ValueError subclass on invalid input)
+_COMPILED: Dict[int, _CompiledCheck] = {}
+
+
+def _parse_json(data: bytes) -> Dict[str, Any]:
+    """Parse a JSON document from bytes.
+    
+    Args:
+        data: UTF-8 JSON bytes (one read of the file).
+        
     Returns:
-        Draft7Validator configured for vlm_hypothesis.schema.json
+        Parsed JSON document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _inline_refs(
+    node: Any,
+    base_uri: str,
+    store: Dict[str, Dict[str, Any]],
+    expanding: FrozenSet[str] = frozenset()
+) -> Any:
+    """Return a copy of node with every $ref replaced by its target schema.
+    
+    As in Draft 7, keywords next to a $ref are ignored, so the target
+    replaces the whole node. Validators built from the result need no
+    resolver.
+    
+    Args:
+        node: Schema (or sub-schema) to expand.
+        base_uri: URI that relative refs in node resolve against.
+        store: Loaded schemas keyed by absolute URI.
+        expanding: Ref URIs currently being expanded (cycle guard).
+        
+    Returns:
+        Expanded copy of node.
+        
+    Raises:
+        ValueError: If a ref is recursive or points outside the store.
+    """
+    if isinstance(node, list):
+        return [_inline_refs(item, base_uri, store, expanding) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" not in node:
+        return {key: _inline_refs(value, base_uri, store, expanding) for key, value in node.items()}
+    
+    ref_uri = urljoin(base_uri, node["$ref"])
+    if ref_uri in expanding:
+        raise ValueError(f"Recursive $ref cannot be inlined: {ref_uri}")
+    doc_uri, _, fragment = ref_uri.partition("#")
+    if doc_uri not in store:
+        raise ValueError(f"Unresolvable $ref: {ref_uri}")
+    target: Any = store[doc_uri]
+    for part in filter(None, fragment.split("/")):
+        part = part.replace("~1", "/").replace("~0", "~")
+        target = target[int(part)] if isinstance(target, list) else target[part]
+    
+    return _inline_refs(target, doc_uri, store, expanding | {ref_uri})
+
+
+class SchemaBundle(NamedTuple):
+    """Loaded schemas and their validators.
+    
+    Unpacks like the plain 4-tuple that load_validators() used to return.
     """
-    schema_dir = Path("schema").resolve()
-    schema_dir_uri = schema_dir.as_uri() + "/"
+    vlm_schema: Dict[str, Any]
+    belief_schema: Dict[str, Any]
+    vlm_validator: Draft7Validator
+    belief_validator: Draft7Validator
+
+
+@lru_cache(maxsize=None)
+def _build_validators(schema_dir: str) -> SchemaBundle:
+    """Load schemas and build validators once per schema directory.
+    
+    Args:
+        schema_dir: Absolute path of the schema directory (cache key).
+        
+    Returns:
+        SchemaBundle of (vlm_schema, belief_schema, vlm_validator, belief_validator)
+    """
+    schema_path = Path(schema_dir)
+    schema_dir_uri = schema_path.as_uri() + "/"
     
     # Load schemas
-    vlm_schema_path = schema_dir / "vlm_hypothesis.schema.json"
-    belief_schema_path = schema_dir / "belief_state.schema.json"
+    vlm_schema_path = schema_path / "vlm_hypothesis.schema.json"
+    belief_schema_path = schema_path / "belief_state.schema.json"
     
-    with open(vlm_schema_path, "r", encoding="utf-8") as f:
-        vlm_schema = json.load(f)
+    vlm_bytes = vlm_schema_path.read_bytes()
+    vlm_schema = _parse_json(vlm_bytes)
+    belief_schema = _parse_json(belief_schema_path.read_bytes())
     
-    with open(belief_schema_path, "r", encoding="utf-8") as f:
-        belief_schema = json.load(f)
+    # Check schemas once here rather than on every validator construction
+    Draft7Validator.check_schema(vlm_schema)
+    Draft7Validator.check_schema(belief_schema)
     
     # Build explicit store mapping for $ref resolution
     store = {
@@ -36,13 +144,44 @@ def load_hypothesis_validator() -> Draft7Validator:
         f"{schema_dir_uri}belief_state.schema.json": belief_schema
     }
     
-    # Create resolver and validator
-    # belief_schema references vlm_schema via $ref, so use belief_schema as referrer
-    belief_schema_uri = f"{schema_dir_uri}belief_state.schema.json"
-    resolver = RefResolver(base_uri=belief_schema_uri, referrer=belief_schema, store=store)
-    vlm_validator = Draft7Validator(vlm_schema, resolver=resolver)
+    # belief_schema references vlm_schema via $ref; inline it once here so
+    # validation is a flat walk with no resolver lookups
+    vlm_flat = _inline_refs(vlm_schema, f"{schema_dir_uri}vlm_hypothesis.schema.json", store)
+    belief_flat = _inline_refs(belief_schema, f"{schema_dir_uri}belief_state.schema.json", store)
+    vlm_validator = Draft7Validator(vlm_flat)
+    belief_validator = Draft7Validator(belief_flat)
+    
+    # Use the pre-generated VLM check (no compile at startup) only when it
+    # was generated from this exact file
+    if (
+        _vlm_validator_gen is not None
+        and _vlm_validator_gen.SCHEMA_SHA256 == hashlib.sha256(vlm_bytes).hexdigest()
+    ):
+        _COMPILED[id(vlm_validator)] = _CompiledCheck(vlm_validator, _vlm_validator_gen.validate)
+    
+    return SchemaBundle(vlm_schema, belief_schema, vlm_validator, belief_validator)
+
+
+def load_validators() -> SchemaBundle:
+    """Load VLM hypothesis and belief state validators.
+    
+    Validators are built once per schema directory and cached.
     
-    return vlm_validator
+    Returns:
+        SchemaBundle of (vlm_schema, belief_schema, vlm_validator, belief_validator)
+    """
+    return _build_validators(str(Path("schema").resolve()))
+
+
+def load_hypothesis_validator() -> Draft7Validator:
+    """Load VLM hypothesis validator with Windows-compatible $ref resolution.
+    
+    The validator is cached and shared by all callers.
+    
+    Returns:
+        Draft7Validator configured for vlm_hypothesis.schema.json
+    """
+    return load_validators().vlm_validator
 
 
 def validate_or_error(
@@ -59,12 +198,22 @@ def validate_or_error(
         Tuple of (is_valid, error_info). error_info is None if valid, otherwise
         contains keys: message, path (list), schema_path (list), type.
     """
-    errors = list(validator.iter_errors(instance))
-    if not errors:
+    # Fast path: a compiled check accepts valid instances without walking
+    # the schema through jsonschema. Failures fall through to iter_errors so
+    # error_info is exactly what jsonschema reports.
+    compiled = _COMPILED.get(id(validator))
+    if compiled is not None and compiled.validator is validator:
+        try:
+            compiled.check(instance)
+            return True, None
+        except ValueError:
+            pass
+    
+    # Only the first error is reported, so stop at it
+    error = next(validator.iter_errors(instance), None)
+    if error is None:
         return True, None
     
-    # Get first error for details
-    error = errors[0]
     return False, {
         "message": error.message,
         "path": list(error.absolute_path),
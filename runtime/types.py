@@ -0,0 +1,161 @@
+"""Core types for the runtime loop."""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass(slots=True)
+class BeliefState:
+    """Belief state of the navigation agent (see belief_state.schema.json).
+    
+    Slotted so the per-step update reads and writes fixed attribute slots
+    instead of hashing dict keys. Use to_dict() / from_dict() at the schema
+    validation and logging boundaries. Item access (belief["key"],
+    belief.get("key")) is supported for code written against the dict form.
+    
+    Attributes:
+        target_status: One of searching, visible, likely_in_memory,
+            unreachable, done.
+        goal_text: Natural language goal description.
+        active_constraints: Active constraint strings.
+        candidate_nodes: Retrieved candidates with node_id and score.
+        next_action: Action chosen for this step.
+        current_node_id: Node the robot is at, or None.
+        last_vlm_hypothesis: Last schema-valid VLM hypothesis, or None.
+        rejection_reason: Why the last hypothesis was rejected, or None.
+        last_visibility: Last VisibilityResult dict, or None.
+        visibility_streak: Consecutive visible perception hits.
+        last_seen_node_id: Node where the target became visible, or None.
+        visible_since_step: Step at which the target became visible, or None.
+    """
+    target_status: str
+    goal_text: str
+    active_constraints: List[str] = field(default_factory=list)
+    candidate_nodes: List[Dict[str, Any]] = field(default_factory=list)
+    next_action: str = "explore"
+    current_node_id: Optional[int] = None
+    last_vlm_hypothesis: Optional[Dict[str, Any]] = None
+    rejection_reason: Optional[str] = None
+    last_visibility: Optional[Dict[str, Any]] = None
+    visibility_streak: int = 0
+    last_seen_node_id: Optional[int] = None
+    visible_since_step: Optional[int] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BeliefState":
+        """Build a BeliefState from its dict form.
+        
+        Args:
+            data: Belief state dict (keys are field names).
+            
+        Returns:
+            BeliefState with the same values (containers are not copied).
+        """
+        return cls(**data)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the belief state dict form (shallow).
+        
+        Returns:
+            Dict with one key per field, in schema field order.
+        """
+        return {name: getattr(self, name) for name in _BELIEF_FIELDS}
+    
+    # Mapping compatibility for dict-style callers
+    def __getitem__(self, key: str) -> Any:
+        if key not in _BELIEF_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _BELIEF_FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in _BELIEF_FIELD_SET
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(_BELIEF_FIELDS)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field value by name, or default if key is not a field."""
+        if key not in _BELIEF_FIELD_SET:
+            return default
+        return getattr(self, key)
+
+
+_BELIEF_FIELDS = tuple(f.name for f in fields(BeliefState))
+_BELIEF_FIELD_SET = frozenset(_BELIEF_FIELDS)
+
+
+@dataclass(slots=True)
+class StepMeta:
+    """Per-step metadata logged alongside the belief transition.
+    
+    Slotted so the loop fills fixed attribute slots instead of a fresh
+    dict literal each step. Use to_dict() when handing the step to the
+    logger. Backend-specific keys (Ollama client fields, memory context
+    diagnostics) go in extra and are merged into the dict form.
+    
+    Attributes:
+        vlm_latency_ms: Milliseconds spent producing and validating VLM output.
+        verify_latency_ms: Milliseconds spent in the verifier.
+        validation_error: First schema/parse error for the VLM output, or None.
+        retrieval_ran: Whether memory retrieval ran (goal had tokens).
+        retrieval_topk: Retrieved candidates with node_id and score.
+        retrieval_best_score: Best candidate score, or None.
+        retrieval_threshold_pass: Whether the best score met the threshold.
+        vlm_backend: VLM backend used ("mock", "ollama", or "fallback_shortcut"
+            when --skip-vlm-when-visible bypassed the model).
+        vlm_status: VALID, PARSE_FAIL or SCHEMA_BAD.
+        planner_status: Verifier reason_code (SKIPPED if not verified).
+        perception_backend: Perception backend used.
+        perception_visible: Whether the target was visible.
+        perception_confidence: Perception confidence in [0.0, 1.0].
+        perception_latency_ms: Milliseconds taken by the visibility check.
+        perception_distance_m: Distance to target in meters, or None.
+        perception_bearing_rad: Bearing to target in radians, or None.
+        perception_target_goal_key: Normalized goal key, or None.
+        visibility_streak: Consecutive visible perception hits.
+        belief_transition: Perception-driven status transition label, or None.
+        perception_reason: Short explanation from the visibility check.
+        perception_evidence: Full evidence dict from the visibility check.
+        extra: Backend-specific fields merged into the dict form.
+    """
+    vlm_latency_ms: float = 0.0
+    verify_latency_ms: float = 0.0
+    validation_error: Optional[Dict[str, Any]] = None
+    retrieval_ran: bool = False
+    retrieval_topk: List[Dict[str, Any]] = field(default_factory=list)
+    retrieval_best_score: Optional[float] = None
+    retrieval_threshold_pass: bool = False
+    vlm_backend: str = "mock"
+    vlm_status: str = ""
+    planner_status: str = ""
+    perception_backend: Optional[str] = None
+    perception_visible: bool = False
+    perception_confidence: float = 0.0
+    perception_latency_ms: float = 0.0
+    perception_distance_m: Optional[float] = None
+    perception_bearing_rad: Optional[float] = None
+    perception_target_goal_key: Optional[str] = None
+    visibility_streak: int = 0
+    belief_transition: Optional[str] = None
+    perception_reason: Optional[str] = None
+    perception_evidence: Optional[Dict[str, Any]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the logged meta dict form (shallow).
+        
+        Returns:
+            Dict with one key per field (except extra), followed by the
+            entries of extra.
+        """
+        data = {name: getattr(self, name) for name in _STEP_META_FIELDS}
+        data.update(self.extra)
+        return data
+
+
+_STEP_META_FIELDS = tuple(f.name for f in fields(StepMeta) if f.name != "extra")
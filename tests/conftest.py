@@ -0,0 +1,46 @@
+"""Shared pytest fixtures and test helpers."""
+
+import pytest
+
+from memory.embedding import DeterministicEmbedder
+from runtime.loop import load_schemas
+from runtime.schema_loader import load_hypothesis_validator
+
+
+def make_belief(**overrides):
+    """Return a fresh schema-valid belief, with the given keys overridden.
+    
+    List fields are new objects on every call, so tests may mutate them
+    without affecting each other.
+    """
+    belief = {
+        "target_status": "searching",
+        "goal_text": "test",
+        "active_constraints": [],
+        "candidate_nodes": [],
+        "next_action": "explore",
+        "current_node_id": None,
+        "last_vlm_hypothesis": None,
+        "rejection_reason": None
+    }
+    belief.update(overrides)
+    return belief
+
+
+@pytest.fixture(scope="session")
+def hypothesis_validator():
+    """VLM hypothesis validator, loaded once per test session."""
+    return load_hypothesis_validator()
+
+
+@pytest.fixture(scope="session")
+def schemas():
+    """SchemaBundle from runtime.loop.load_schemas(), loaded once per session."""
+    return load_schemas()
+
+
+@pytest.fixture(scope="session")
+def embedder():
+    """Stateless 64-d embedder shared by all tests."""
+    return DeterministicEmbedder(dim=64)
+
@@ -0,0 +1,92 @@
+"""Tests for per-step belief state update rules."""
+
+from runtime.belief_update import apply_perception_update, apply_vlm_decision
+from runtime.types import BeliefState
+from tests.conftest import make_belief
+
+
+def _belief(**overrides):
+    """Build a belief state for update tests."""
+    belief = make_belief(
+        goal_text="red backpack",
+        current_node_id=5,
+        last_visibility=None,
+        visibility_streak=0,
+        last_seen_node_id=None,
+        visible_since_step=None
+    )
+    belief.update(overrides)
+    return BeliefState.from_dict(belief)
+
+
+def _vr(is_visible):
+    """Build a node_oracle visibility result."""
+    return {"is_visible": is_visible, "confidence": 0.9 if is_visible else 0.0, "backend": "node_oracle"}
+
+
+def test_apply_vlm_decision_goto_node_moves_robot():
+    """Test that an accepted goto_node hypothesis updates current_node_id."""
+    belief = _belief(current_node_id=None)
+    hypothesis = {"action": "goto_node", "navigation_goal": {"type": "node_id", "node_id": 3}}
+    
+    apply_vlm_decision(belief, hypothesis, {"ok": True, "reason_code": "OK"}, None)
+    
+    assert belief.next_action == "goto_node"
+    assert belief.current_node_id == 3
+    assert belief.rejection_reason is None
+    assert belief.target_status == "searching"
+
+
+def test_apply_vlm_decision_invalid_hypothesis_explores():
+    """Test that a parse failure rejects the hypothesis and falls back to explore."""
+    belief = _belief()
+    
+    apply_vlm_decision(belief, None, {"ok": False, "reason_code": "SKIPPED"}, {"type": "json_parse"})
+    
+    assert belief.last_vlm_hypothesis is None
+    assert belief.rejection_reason == "VLM_INVALID:json_parse"
+    assert belief.next_action == "explore"
+
+
+def test_apply_perception_update_hysteresis_then_done():
+    """Test K=2 hysteresis to visible, then approach to done on a later step."""
+    belief = _belief()
+    
+    assert apply_perception_update(belief, _vr(True), step_id=0) is None
+    assert belief.target_status == "searching"
+    
+    assert apply_perception_update(belief, _vr(True), step_id=1) == "searching->visible"
+    assert belief.last_seen_node_id == 5
+    assert belief.visible_since_step == 1
+    
+    belief.next_action = "approach"
+    assert apply_perception_update(belief, _vr(True), step_id=2) == "visible->done"
+    assert belief.target_status == "done"
+
+
+def test_apply_perception_update_miss_resets_streak():
+    """Test that a miss resets the visibility streak."""
+    belief = _belief(visibility_streak=1)
+    
+    assert apply_perception_update(belief, _vr(False), step_id=0) is None
+    assert belief.visibility_streak == 0
+    assert belief.last_visibility == _vr(False)
+
+
+def test_belief_state_round_trips_dict_form():
+    """Test BeliefState dict conversion and dict-style item access."""
+    belief = _belief()
+    
+    data = belief.to_dict()
+    assert list(data) == [
+        "target_status", "goal_text", "active_constraints", "candidate_nodes",
+        "next_action", "current_node_id", "last_vlm_hypothesis", "rejection_reason",
+        "last_visibility", "visibility_streak", "last_seen_node_id", "visible_since_step"
+    ]
+    assert BeliefState.from_dict(data) == belief
+    
+    belief["target_status"] = "visible"
+    assert belief.target_status == "visible"
+    assert belief.get("goal_text") == "red backpack"
+    assert belief.get("not_a_field", "default") == "default"
+    assert "visibility_streak" in belief
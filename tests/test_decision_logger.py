@@ -0,0 +1,112 @@
+"""Tests for the JSONL decision logger."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from runtime import logger as logger_module
+from runtime.logger import DecisionLogger
+
+
+def _log_one_step(log: DecisionLogger) -> None:
+    """Write a representative step with non-native JSON values."""
+    log.log_step(
+        step_id=0,
+        belief_before={"goal_text": "red backpack", "candidate_nodes": [{"node_id": 1, "score": 0.5}]},
+        vlm_raw="raw output",
+        vlm_validated=None,
+        verifier_result={"accepted": True},
+        belief_after={"goal_text": "red backpack", "path": Path("logs")},
+        meta={"scores": {3: 0.25}}
+    )
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_log_step_writes_json_line(tmp_path, monkeypatch, use_orjson):
+    """Test that log_step writes one JSON object per line with either encoder."""
+    if use_orjson and logger_module.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(logger_module, "orjson", None)
+    monkeypatch.chdir(tmp_path)
+    
+    log = DecisionLogger()
+    _log_one_step(log)
+    log.close()
+    
+    raw = (tmp_path / "logs" / "decisions.jsonl").read_text(encoding="utf-8")
+    assert raw.endswith("\n")
+    lines = raw.splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["step_id"] == 0
+    assert entry["event_type"] == "STEP"
+    assert entry["belief_after"]["path"] == "logs"
+    assert entry["meta"]["scores"] == {"3": 0.25}
+
+
+def test_log_step_buffers_until_flush(tmp_path, monkeypatch):
+    """Test that lines are buffered and written on flush_every/flush()/close()."""
+    monkeypatch.chdir(tmp_path)
+    log_path = tmp_path / "logs" / "decisions.jsonl"
+    
+    log = DecisionLogger(flush_every=2)
+    _log_one_step(log)
+    assert log_path.read_bytes() == b""
+    _log_one_step(log)
+    assert len(log_path.read_bytes().splitlines()) == 2
+    
+    _log_one_step(log)
+    log.flush()
+    assert len(log_path.read_bytes().splitlines()) == 3
+    
+    _log_one_step(log)
+    log.close()
+    log.close()
+    assert len(log_path.read_bytes().splitlines()) == 4
+
+
+def test_utc_timestamp_is_iso_utc():
+    """Test that the cached timestamp formatter yields current ISO-8601 UTC."""
+    stamp = logger_module._utc_timestamp()
+    
+    assert stamp.endswith("Z")
+    parsed = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(now - parsed) < timedelta(seconds=5)
+
+
+def test_context_manager_closes_file(tmp_path, monkeypatch):
+    """Test that leaving the with-block flushes and closes the log file."""
+    monkeypatch.chdir(tmp_path)
+    
+    with DecisionLogger() as log:
+        _log_one_step(log)
+    
+    assert log._file.closed
+    assert len((tmp_path / "logs" / "decisions.jsonl").read_bytes().splitlines()) == 1
+
+
+def test_log_step_embeds_pre_encoded_belief(tmp_path, monkeypatch):
+    """Test that belief_before passed as encode_json() bytes logs like the dict."""
+    monkeypatch.chdir(tmp_path)
+    belief = {"goal_text": "red backpack", "candidate_nodes": [{"node_id": 1, "score": 0.5}]}
+    
+    with DecisionLogger() as log:
+        for before in (belief, logger_module.encode_json(belief)):
+            log.log_step(
+                step_id=0,
+                belief_before=before,
+                vlm_raw=None,
+                vlm_validated=None,
+                verifier_result={},
+                belief_after=belief,
+                meta={}
+            )
+    
+    lines = (tmp_path / "logs" / "decisions.jsonl").read_text(encoding="utf-8").splitlines()
+    entries = [json.loads(line) for line in lines]
+    assert entries[0]["belief_before"] == entries[1]["belief_before"] == belief
+    assert entries[0].keys() == entries[1].keys()
@@ -1,21 +1,21 @@
 """Tests for fallback hypothesis generation."""
 
-from runtime.schema_loader import load_hypothesis_validator, validate_or_error
-from vlm.fallback import generate_fallback_hypothesis
+import pytest
+
+from runtime.schema_loader import validate_or_error
+from tests.conftest import make_belief
+from vlm.fallback import generate_fallback_hypothesis, generate_fallback_hypothesis_batch
+
+
+def test_make_belief_is_schema_valid(schemas):
+    """Test that the shared belief template passes belief_state validation."""
+    assert validate_or_error(schemas.belief_validator, make_belief()) == (True, None)
+    assert make_belief()["candidate_nodes"] is not make_belief()["candidate_nodes"]
 
 
 def test_fallback_when_done():
     """Test fallback when target_status is 'done'."""
-    belief = {
-        "target_status": "done",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "stop",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(target_status="done", next_action="stop")
     candidates = []
     
     hypothesis = generate_fallback_hypothesis(belief, candidates)
@@ -28,16 +28,7 @@ def test_fallback_when_done():
 
 def test_fallback_when_visible():
     """Test fallback when target_status is 'visible'."""
-    belief = {
-        "target_status": "visible",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "approach",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(target_status="visible", next_action="approach")
     candidates = []
     
     hypothesis = generate_fallback_hypothesis(belief, candidates)
@@ -53,16 +44,7 @@ def test_fallback_when_visible():
 
 def test_fallback_with_candidates():
     """Test fallback with candidate nodes."""
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [{"node_id": 5, "score": 0.8}],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(candidate_nodes=[{"node_id": 5, "score": 0.8}])
     candidates = [{"node_id": 5, "score": 0.8}, {"node_id": 3, "score": 0.6}]
     
     hypothesis = generate_fallback_hypothesis(belief, candidates)
@@ -76,16 +58,7 @@ def test_fallback_with_candidates():
 
 def test_fallback_without_candidates():
     """Test fallback without candidate nodes."""
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief()
     candidates = []
     
     hypothesis = generate_fallback_hypothesis(belief, candidates)
@@ -95,48 +68,26 @@ def test_fallback_without_candidates():
     assert hypothesis["confidence"] == 0.3
 
 
-def test_fallback_outputs_are_schema_valid():
+@pytest.mark.parametrize("status,candidates", [
+    ("done", []),
+    ("visible", []),
+    ("searching", [{"node_id": 5, "score": 0.8}]),
+    ("searching", []),
+    ("likely_in_memory", [{"node_id": 3, "score": 0.7}]),
+])
+def test_fallback_outputs_are_schema_valid(hypothesis_validator, status, candidates):
     """Test that all fallback outputs are schema-valid."""
-    validator = load_hypothesis_validator()
+    belief = make_belief(target_status=status, candidate_nodes=candidates)
     
-    test_cases = [
-        ({"target_status": "done"}, []),
-        ({"target_status": "visible"}, []),
-        ({"target_status": "searching"}, [{"node_id": 5, "score": 0.8}]),
-        ({"target_status": "searching"}, []),
-        ({"target_status": "likely_in_memory"}, [{"node_id": 3, "score": 0.7}]),
-    ]
+    hypothesis = generate_fallback_hypothesis(belief, candidates)
     
-    for belief_partial, candidates in test_cases:
-        belief = {
-            "target_status": belief_partial.get("target_status", "searching"),
-            "goal_text": "test",
-            "active_constraints": [],
-            "candidate_nodes": candidates,
-            "next_action": "explore",
-            "current_node_id": None,
-            "last_vlm_hypothesis": None,
-            "rejection_reason": None
-        }
-        
-        hypothesis = generate_fallback_hypothesis(belief, candidates)
-        
-        is_valid, error = validate_or_error(validator, hypothesis)
-        assert is_valid, f"Fallback hypothesis invalid for {belief_partial}: {error}"
+    is_valid, error = validate_or_error(hypothesis_validator, hypothesis)
+    assert is_valid, f"Fallback hypothesis invalid for {status}: {error}"
 
 
 def test_fallback_deterministic():
     """Test that fallback is deterministic (same inputs → same outputs)."""
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [{"node_id": 5, "score": 0.8}],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(candidate_nodes=[{"node_id": 5, "score": 0.8}])
     candidates = [{"node_id": 5, "score": 0.8}]
     
     hypothesis1 = generate_fallback_hypothesis(belief, candidates)
@@ -144,3 +95,30 @@ def test_fallback_deterministic():
     
     assert hypothesis1 == hypothesis2
 
+
+
+def test_validate_or_error_reports_first_error(hypothesis_validator):
+    """Test that an invalid hypothesis yields a single structured error."""
+    is_valid, error = validate_or_error(hypothesis_validator, {"action": "fly"})
+    
+    assert not is_valid
+    assert error["type"] == "schema"
+    assert set(error) == {"message", "path", "schema_path", "type"}
+    assert isinstance(error["path"], list)
+
+
+def test_batch_equivalence():
+    """Test that the batch API matches per-call generation."""
+    pairs = [
+        (make_belief(target_status="done"), []),
+        (make_belief(target_status="visible"), []),
+        (make_belief(), [{"node_id": 5, "score": 0.8}]),
+        (make_belief(), []),
+    ]
+    
+    batch = generate_fallback_hypothesis_batch(pairs)
+    
+    assert batch == [generate_fallback_hypothesis(b, c) for b, c in pairs]
+    # Results are independent copies, not shared templates
+    batch[1]["navigation_goal"]["distance_meters"] = 9.0
+    assert generate_fallback_hypothesis(*pairs[1])["navigation_goal"]["distance_meters"] == 1.0
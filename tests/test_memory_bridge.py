@@ -1,20 +1,14 @@
 """Tests for memory bridge belief state transitions."""
 
+import pytest
+
 from runtime.memory_bridge import apply_memory_retrieval
+from tests.conftest import make_belief
 
 
 def test_visible_never_demotes():
     """Test that visible status is never changed by retrieval."""
-    belief = {
-        "target_status": "visible",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "approach",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(target_status="visible", next_action="approach")
     
     # Low score candidates
     candidates = [{"node_id": 1, "score": 0.1}]
@@ -27,16 +21,7 @@ def test_visible_never_demotes():
 
 def test_promotion_searching_to_likely_in_memory():
     """Test promotion from searching to likely_in_memory with high score."""
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief()
     
     # High score candidates
     candidates = [{"node_id": 2, "score": 0.8}]
@@ -50,16 +35,7 @@ def test_promotion_searching_to_likely_in_memory():
 
 def test_searching_stays_searching_with_low_score():
     """Test that searching remains searching with low score."""
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief()
     
     # Low score candidates
     candidates = [{"node_id": 1, "score": 0.1}]
@@ -73,16 +49,11 @@ def test_searching_stays_searching_with_low_score():
 
 def test_no_flapping_likely_in_memory():
     """Test that likely_in_memory does NOT demote to searching on weak retrieval."""
-    belief = {
-        "target_status": "likely_in_memory",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [{"node_id": 3, "score": 0.9}],
-        "next_action": "goto_node",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(
+        target_status="likely_in_memory",
+        candidate_nodes=[{"node_id": 3, "score": 0.9}],
+        next_action="goto_node",
+    )
     
     # Low score candidates (below threshold)
     candidates = [{"node_id": 1, "score": 0.1}]
@@ -96,16 +67,7 @@ def test_no_flapping_likely_in_memory():
 
 def test_done_status_unchanged():
     """Test that done status is never changed by retrieval."""
-    belief = {
-        "target_status": "done",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "stop",
-        "current_node_id": 5,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(target_status="done", next_action="stop", current_node_id=5)
     
     # High score candidates
     candidates = [{"node_id": 2, "score": 0.9}]
@@ -118,16 +80,7 @@ def test_done_status_unchanged():
 
 def test_unreachable_status_unchanged():
     """Test that unreachable status is never changed by retrieval."""
-    belief = {
-        "target_status": "unreachable",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(target_status="unreachable")
     
     # High score candidates
     candidates = [{"node_id": 2, "score": 0.9}]
@@ -138,41 +91,21 @@ def test_unreachable_status_unchanged():
     assert belief["candidate_nodes"] == candidates
 
 
-def test_candidate_nodes_always_set():
+@pytest.mark.parametrize("status", ["visible", "searching", "likely_in_memory", "done", "unreachable"])
+def test_candidate_nodes_always_set(status):
     """Test that candidate_nodes is always updated for all statuses."""
-    statuses = ["visible", "searching", "likely_in_memory", "done", "unreachable"]
-    
-    for status in statuses:
-        belief = {
-            "target_status": status,
-            "goal_text": "test",
-            "active_constraints": [],
-            "candidate_nodes": [],
-            "next_action": "explore",
-            "current_node_id": None,
-            "last_vlm_hypothesis": None,
-            "rejection_reason": None
-        }
-        
-        candidates = [{"node_id": 1, "score": 0.5}]
-        apply_memory_retrieval(belief, candidates, threshold=0.3)
-        
-        assert belief["candidate_nodes"] == candidates, \
-            f"candidate_nodes should be set for status={status}"
+    belief = make_belief(target_status=status)
+    
+    candidates = [{"node_id": 1, "score": 0.5}]
+    apply_memory_retrieval(belief, candidates, threshold=0.3)
+    
+    assert belief["candidate_nodes"] == candidates, \
+        f"candidate_nodes should be set for status={status}"
 
 
 def test_empty_candidates():
     """Test handling of empty candidates list."""
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [{"node_id": 1, "score": 0.5}],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
+    belief = make_belief(candidate_nodes=[{"node_id": 1, "score": 0.5}])
     
     # Empty candidates
     candidates = []
@@ -182,32 +115,16 @@ def test_empty_candidates():
     assert belief["target_status"] == "searching", "Should remain searching with no candidates"
 
 
-def test_threshold_boundary():
+@pytest.mark.parametrize("score,expected", [
+    (0.3, "likely_in_memory"),  # exactly at threshold: promote
+    (0.299, "searching"),  # just below threshold: no promotion
+])
+def test_threshold_boundary(score, expected):
     """Test behavior at threshold boundary."""
-    # Test exactly at threshold
-    belief = {
-        "target_status": "searching",
-        "goal_text": "test",
-        "active_constraints": [],
-        "candidate_nodes": [],
-        "next_action": "explore",
-        "current_node_id": None,
-        "last_vlm_hypothesis": None,
-        "rejection_reason": None
-    }
-    
-    # Exactly at threshold
-    candidates = [{"node_id": 1, "score": 0.3}]
-    apply_memory_retrieval(belief, candidates, threshold=0.3)
+    belief = make_belief()
     
-    assert belief["target_status"] == "likely_in_memory", \
-        "Should promote when score equals threshold"
-    
-    # Just below threshold
-    belief["target_status"] = "searching"
-    candidates = [{"node_id": 1, "score": 0.299}]
+    candidates = [{"node_id": 1, "score": score}]
     apply_memory_retrieval(belief, candidates, threshold=0.3)
     
-    assert belief["target_status"] == "searching", \
-        "Should not promote when score is below threshold"
-
+    assert belief["target_status"] == expected, \
+        f"score={score} at threshold=0.3 should give {expected}"
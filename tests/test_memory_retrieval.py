@@ -1,12 +1,35 @@
 """Tests for memory retrieval functionality."""
 
-from memory.embedding import DeterministicEmbedder
+import numpy as np
+import pytest
+
 from memory.retrieval import retrieve_candidates
-from memory.store import SemanticMemoryStore
+from memory.store import SemanticMemoryStore, seed_demo_store
 from memory.types import Pose2D
 
 
-def test_deterministic_ordering():
+# Module-scoped stores are shared and must only be read; tests that add
+# nodes build their own store
+@pytest.fixture(scope="module")
+def single_node_store():
+    """Store with one "Test node" node tagged "test"."""
+    store = SemanticMemoryStore()
+    store.add_node(
+        pose=Pose2D(x=1.0, y=1.0, yaw=0.0),
+        embedding=None,
+        tags=["test"],
+        summary="Test node"
+    )
+    return store
+
+
+@pytest.fixture(scope="module")
+def demo_store(embedder):
+    """seed_demo_store() with eagerly computed embeddings."""
+    return seed_demo_store(embedder)
+
+
+def test_deterministic_ordering(embedder):
     """Test that retrieval produces identical results for same inputs."""
     # Create store with 3 nodes in non-sorted order
     store = SemanticMemoryStore()
@@ -29,22 +52,22 @@ def test_deterministic_ordering():
         summary="Bedroom with bed"
     )
     
-    embedder = DeterministicEmbedder(dim=64)
     goal_text = "find the kitchen"
     
     # Call retrieve_candidates twice
     result1 = retrieve_candidates(goal_text, store, embedder, k=5)
     result2 = retrieve_candidates(goal_text, store, embedder, k=5)
     
-    # Results should be identical
-    assert result1 == result2, "Results should be deterministic"
+    # Results should be identical (candidates carry only node_id and score)
+    def key(results):
+        return [(r["node_id"], r["score"]) for r in results]
+    assert key(result1) == key(result2), "Results should be deterministic"
     assert len(result1) == 3, "Should return all 3 nodes"
 
 
-def test_tie_break_behavior():
+def test_tie_break_behavior(embedder):
     """Test that tie-breaking uses node_id (lower comes first)."""
     store = SemanticMemoryStore()
-    embedder = DeterministicEmbedder(dim=64)
     
     # Add nodes that will have very similar scores
     # Use identical tags/summary to force ties
@@ -60,13 +83,14 @@ def test_tie_break_behavior():
     results = retrieve_candidates(goal_text, store, embedder, k=5)
     
     # Check that node_ids are in ascending order for tied scores
-    for i in range(len(results) - 1):
-        if abs(results[i]["score"] - results[i+1]["score"]) < 1e-9:
-            assert results[i]["node_id"] < results[i+1]["node_id"], \
-                "Tied scores should be broken by node_id (ascending)"
+    scores = np.fromiter((r["score"] for r in results), dtype=np.float64)
+    ids = np.fromiter((r["node_id"] for r in results), dtype=np.int64)
+    tied = np.isclose(scores[:-1], scores[1:], rtol=0.0, atol=1e-9)
+    assert np.all(ids[:-1][tied] < ids[1:][tied]), \
+        "Tied scores should be broken by node_id (ascending)"
 
 
-def test_score_range():
+def test_score_range(embedder):
     """Test that scores are in [0, 1] range and have correct types."""
     store = SemanticMemoryStore()
     store.add_node(
@@ -82,7 +106,6 @@ def test_score_range():
         summary="Bedroom area"
     )
     
-    embedder = DeterministicEmbedder(dim=64)
     results = retrieve_candidates("find kitchen", store, embedder, k=5)
     
     assert len(results) > 0, "Should have results"
@@ -96,21 +119,10 @@ def test_score_range():
         assert 0.0 <= candidate["score"] <= 1.0, f"Score {candidate['score']} not in [0, 1]"
 
 
-def test_score_mapping():
+def test_score_mapping(single_node_store, embedder):
     """Test that cosine similarity is correctly mapped to [0, 1]."""
-    store = SemanticMemoryStore()
-    embedder = DeterministicEmbedder(dim=64)
-    
-    # Add a node
-    store.add_node(
-        pose=Pose2D(x=1.0, y=1.0, yaw=0.0),
-        embedding=None,
-        tags=["test"],
-        summary="Test node"
-    )
-    
     # Test with matching keyword
-    results = retrieve_candidates("test", store, embedder, k=5)
+    results = retrieve_candidates("test", single_node_store, embedder, k=5)
     assert len(results) == 1
     # Score should be in valid range and reasonably high due to keyword match
     # The word "test" appears in tags, so keyword overlap contributes positively
@@ -118,10 +130,9 @@ def test_score_mapping():
     assert results[0]["score"] > 0.3, "Matching keyword should produce reasonable score"
 
 
-def test_keyword_blending():
+def test_keyword_blending(embedder):
     """Test that keyword overlap is blended with embedding score."""
     store = SemanticMemoryStore()
-    embedder = DeterministicEmbedder(dim=64)
     
     # Add nodes with specific tags
     store.add_node(
@@ -145,70 +156,26 @@ def test_keyword_blending():
     assert results[0]["node_id"] == 0, "Node with matching keywords should rank higher"
 
 
-def test_empty_goal_text():
-    """Test that empty goal_text returns empty list."""
-    store = SemanticMemoryStore()
-    store.add_node(
-        pose=Pose2D(x=1.0, y=1.0, yaw=0.0),
-        embedding=None,
-        tags=["test"],
-        summary="Test node"
-    )
-    
-    embedder = DeterministicEmbedder(dim=64)
-    
-    # Test empty string
-    assert retrieve_candidates("", store, embedder, k=5) == []
+@pytest.mark.parametrize("goal_text", ["", "   ", "\t\n", "!!!", "...", "!@#$%"])
+def test_trivial_goal_text_returns_empty(goal_text, single_node_store, embedder):
+    """Test that empty, whitespace-only and punctuation-only goal_text return []."""
+    assert retrieve_candidates(goal_text, single_node_store, embedder, k=5) == []
 
 
-def test_whitespace_only_goal_text():
-    """Test that whitespace-only goal_text returns empty list."""
-    store = SemanticMemoryStore()
-    store.add_node(
-        pose=Pose2D(x=1.0, y=1.0, yaw=0.0),
-        embedding=None,
-        tags=["test"],
-        summary="Test node"
-    )
-    
-    embedder = DeterministicEmbedder(dim=64)
-    
-    # Test whitespace-only
-    assert retrieve_candidates("   ", store, embedder, k=5) == []
-    assert retrieve_candidates("\t\n", store, embedder, k=5) == []
-
-
-def test_punctuation_only_goal_text():
-    """Test that punctuation-only goal_text returns empty list."""
-    store = SemanticMemoryStore()
-    store.add_node(
-        pose=Pose2D(x=1.0, y=1.0, yaw=0.0),
-        embedding=None,
-        tags=["test"],
-        summary="Test node"
-    )
-    
-    embedder = DeterministicEmbedder(dim=64)
-    
-    # Test punctuation-only
-    assert retrieve_candidates("!!!", store, embedder, k=5) == []
-    assert retrieve_candidates("...", store, embedder, k=5) == []
-    assert retrieve_candidates("!@#$%", store, embedder, k=5) == []
-
-
-def test_top_k_limit():
+def test_top_k_limit(embedder):
     """Test that results are limited to k."""
     store = SemanticMemoryStore()
-    embedder = DeterministicEmbedder(dim=64)
     
     # Add 10 nodes
-    for i in range(10):
-        store.add_node(
-            pose=Pose2D(x=float(i), y=0.0, yaw=0.0),
-            embedding=None,
-            tags=["node", f"node{i}"],
-            summary=f"Node {i}"
-        )
+    store.add_nodes(
+        {
+            "pose": Pose2D(x=float(i), y=0.0, yaw=0.0),
+            "embedding": None,
+            "tags": ["node", f"node{i}"],
+            "summary": f"Node {i}"
+        }
+        for i in range(10)
+    )
     
     # Request only top 3
     results = retrieve_candidates("node", store, embedder, k=3)
@@ -216,14 +183,13 @@ def test_top_k_limit():
     assert len(results) == 3, "Should return at most k results"
 
 
-def test_garbage_candidate_guard():
+def test_garbage_candidate_guard(embedder):
     """Test that garbage candidate guard reduces scores for low-signal matches.
     
     The guard applies when keyword_score == 0 AND embedding_score is near 0.5
     (within 0.05), reducing the final_score by half.
     """
     store = SemanticMemoryStore()
-    embedder = DeterministicEmbedder(dim=64)
     
     # Add nodes with completely unrelated content (no keyword overlap)
     # Goal: "find kitchen appliance" - no overlap with these nodes
@@ -286,3 +252,222 @@ def test_garbage_candidate_guard():
         assert isinstance(candidate["node_id"], int), "node_id must be int"
         assert isinstance(candidate["score"], float), "score must be float"
 
+
+
+def test_store_embedder_precomputes_embeddings(embedder):
+    """Test that a store with an embedder caches embeddings at insert time."""
+    store_eager = SemanticMemoryStore(embedder)
+    store_lazy = SemanticMemoryStore()
+    
+    for store in (store_eager, store_lazy):
+        store.add_node(
+            pose=Pose2D(x=1.0, y=1.0, yaw=0.0),
+            embedding=None,
+            tags=["kitchen", "stove"],
+            summary="Kitchen area with stove"
+        )
+        store.add_node(
+            pose=Pose2D(x=2.0, y=2.0, yaw=0.0),
+            embedding=None,
+            tags=["bedroom", "bed"],
+            summary="Bedroom with bed"
+        )
+    
+    # Embeddings and token sets are computed once at insert
+    node = store_eager.get_node(0)
+    assert node.embedding is not None
+    assert node.embedding.shape == (64,)
+    assert node.combined_text == "Kitchen area with stove kitchen stove"
+    assert node.token_set == frozenset(["kitchen", "area", "with", "stove"])
+    
+    # Token bitmasks count overlap exactly; unknown tokens have no bit
+    goal_mask = store_eager.token_mask(["kitchen", "with", "unknown"])
+    assert (goal_mask & node.token_mask).bit_count() == 2
+    assert (goal_mask & store_eager.get_node(1).token_mask).bit_count() == 1
+    
+    # Eager and lazy stores must score identically
+    goal_text = "find the kitchen"
+    assert retrieve_candidates(goal_text, store_eager, embedder, k=5) == \
+        retrieve_candidates(goal_text, store_lazy, embedder, k=5)
+
+
+def test_quantized_scores_match_float(demo_store, embedder):
+    """Test that int8-quantized scoring approximates float32 scoring."""
+    for goal_text in ["find the kitchen", "go to the bedroom", "red backpack"]:
+        exact = retrieve_candidates(goal_text, demo_store, embedder, k=5)
+        approx = retrieve_candidates(goal_text, demo_store, embedder, k=5, quantized=True)
+        
+        assert approx[0]["node_id"] == exact[0]["node_id"]
+        exact_scores = {c["node_id"]: c["score"] for c in exact}
+        for c in approx:
+            assert abs(c["score"] - exact_scores[c["node_id"]]) < 0.02
+
+
+def test_cosine_similarity_edge_cases():
+    """Test cosine_similarity on aligned, zero and mismatched vectors."""
+    from memory.retrieval import cosine_similarity
+    
+    assert cosine_similarity([1.0, 0.0], [2.0, 0.0]) == pytest.approx(1.0)
+    assert cosine_similarity([1.0, 0.0], [0.0, 3.0]) == pytest.approx(0.0)
+    assert cosine_similarity([1.0, 1.0], [-1.0, -1.0]) == pytest.approx(-1.0)
+    assert cosine_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+    assert cosine_similarity([1.0, 0.0], [1.0, 0.0, 0.0]) == 0.0
+
+
+def test_query_context_matches_goal_text(embedder):
+    """Test that a reused QueryContext scores like passing goal_text."""
+    from memory.retrieval import QueryContext
+    
+    store = seed_demo_store(embedder)
+    ctx = QueryContext.make(embedder, "find the kitchen counter")
+    
+    expected = retrieve_candidates("find the kitchen counter", store, embedder, k=5)
+    assert retrieve_candidates(ctx, store, embedder, k=5) == expected
+    
+    # Goal mask is recomputed once the store vocabulary grows
+    store.add_node(
+        pose=Pose2D(x=0.0, y=0.0, yaw=0.0),
+        embedding=None,
+        tags=["find"],
+        summary="Lost and found"
+    )
+    assert retrieve_candidates(ctx, store, embedder, k=6) == \
+        retrieve_candidates("find the kitchen counter", store, embedder, k=6)
+
+
+def test_query_context_mask_not_shared_across_stores(embedder):
+    """Test that a cached goal mask is not reused for a different store."""
+    from memory.retrieval import QueryContext
+    
+    ctx = QueryContext.make(embedder, "kitchen")
+    first = SemanticMemoryStore()
+    first.add_node(pose=Pose2D(x=0.0, y=0.0, yaw=0.0), embedding=None, tags=["kitchen"], summary="A")
+    second = SemanticMemoryStore()
+    second.add_node(pose=Pose2D(x=0.0, y=0.0, yaw=0.0), embedding=None, tags=["bedroom"], summary="A")
+    
+    # Same vocabulary size, different token -> bit layout
+    assert first.vocab_size == second.vocab_size
+    assert first.uid != second.uid
+    assert ctx.goal_mask(first) != 0
+    assert ctx.goal_mask(second) == 0
+
+
+def test_embedding_matrix_grows_in_place(embedder):
+    """Test that nodes added after a query extend the cached matrix correctly."""
+    store = seed_demo_store(embedder)
+    store.embedding_matrix(embedder)  # build the buffer
+    
+    # Enough nodes to force at least one capacity doubling
+    for i in range(12):
+        store.add_node(
+            pose=Pose2D(x=float(i), y=0.0, yaw=0.0),
+            embedding=None,
+            tags=[f"tag{i}"],
+            summary=f"Extra node {i}"
+        )
+    
+    fresh = SemanticMemoryStore(embedder)
+    for node in store.all_nodes():
+        fresh.add_node(pose=node.pose, embedding=None, tags=node.tags, summary=node.summary)
+    
+    assert store.embedding_matrix(embedder).shape == (17, 64)
+    assert np.array_equal(store.embedding_matrix(embedder), fresh.embedding_matrix(embedder))
+    assert store.node_ids().tolist() == list(range(17))
+    assert store.token_masks() == fresh.token_masks()
+
+
+def test_store_version_bumps_on_add():
+    """Test that the store version changes on every mutation."""
+    store = SemanticMemoryStore()
+    assert store.version == 0
+    
+    store.add_node(pose=Pose2D(x=0.0, y=0.0, yaw=0.0), embedding=None, tags=["a"], summary="A")
+    store.add_node(pose=Pose2D(x=1.0, y=0.0, yaw=0.0), embedding=None, tags=["b"], summary="B")
+    
+    assert store.version == 2
+
+
+def test_add_nodes_matches_add_node(embedder):
+    """Test that bulk insertion matches per-node insertion."""
+    specs = [
+        {"pose": Pose2D(x=float(i), y=0.0, yaw=0.0), "embedding": None,
+         "tags": [f"tag{i}"], "summary": f"Node {i}"}
+        for i in range(3)
+    ]
+    single = SemanticMemoryStore(embedder)
+    for spec in specs:
+        single.add_node(**spec)
+    bulk = SemanticMemoryStore(embedder)
+    
+    assert bulk.add_nodes(specs) == [0, 1, 2]
+    assert bulk.version == single.version == 3
+    assert bulk.token_masks() == single.token_masks()
+    assert retrieve_candidates("node tag1", bulk, embedder, k=5) == \
+        retrieve_candidates("node tag1", single, embedder, k=5)
+
+
+def test_add_nodes_grows_built_matrix_once(demo_store, embedder):
+    """Test that bulk insertion into a built buffer reserves all rows up front."""
+    store = seed_demo_store(embedder)
+    store.embedding_matrix(embedder)  # build the buffer (capacity 8)
+    
+    store.add_nodes(
+        {"pose": Pose2D(x=float(i), y=0.0, yaw=0.0), "embedding": None,
+         "tags": [f"tag{i}"], "summary": f"Extra node {i}"}
+        for i in range(20)
+    )
+    
+    assert len(store._embeddings) == 25
+    assert store.embedding_matrix(embedder).shape == (25, 64)
+    assert np.array_equal(store.embedding_matrix(embedder)[:5], demo_store.embedding_matrix(embedder))
+    assert store.node_ids().tolist() == list(range(25))
+
+
+def test_embed_text_is_memoized_and_read_only(embedder):
+    """Test that repeated embeddings share one read-only cached array."""
+    first = embedder.embed_text("Red Backpack ")
+    
+    assert embedder.embed_text("red backpack") is first
+    assert not first.flags.writeable
+    
+    embedder.cache_clear()
+    again = embedder.embed_text("red backpack")
+    assert again is not first
+    assert np.array_equal(again, first)
+
+
+def test_tokenize_strips_unicode_punctuation():
+    """Test that non-ASCII punctuation is removed like ASCII punctuation."""
+    from memory.utils import tokenize
+    
+    assert tokenize("backpack\u2014red") == ("backpackred",)
+    assert tokenize("user\u2019s \u201cRed\u201d bag") == ("users", "red", "bag")
+    assert tokenize("user's \"Red\" bag") == ("users", "red", "bag")
+    assert tokenize("caf\u00e9 snake_case!") == ("caf\u00e9", "snake_case")
+
+
+def test_tokenize_interns_tokens():
+    """Test that equal tokens from different texts are the same object."""
+    from memory.utils import tokenize
+    
+    kitchen_node = tokenize("Kitchen counter")
+    kitchen_goal = tokenize("find the KITCHEN!")
+    
+    assert kitchen_node[0] == kitchen_goal[2] == "kitchen"
+    assert kitchen_node[0] is kitchen_goal[2]
+
+
+def test_vectorized_blend_matches_loop():
+    """Test that the array-op score blend matches the reference loop exactly."""
+    from memory.retrieval import _blend_scores_np, _blend_scores_py
+    
+    rng = np.random.default_rng(0)
+    embedding_scores = rng.random(64, dtype=np.float32)
+    # Half the nodes land in the garbage-guard band around 0.5
+    embedding_scores[::2] = rng.uniform(0.44, 0.56, 32).astype(np.float32)
+    overlaps = rng.integers(0, 3, 64)
+    
+    assert np.array_equal(
+        _blend_scores_np(embedding_scores, overlaps, 3),
+        _blend_scores_py(embedding_scores, overlaps, 3)
+    )
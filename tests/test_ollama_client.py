@@ -3,7 +3,9 @@
 import json
 from unittest.mock import Mock, patch
 
-from vlm.ollama_client import OllamaVLMClient
+import pytest
+
+from vlm.ollama_client import _DONE_GRACE_LINES, OllamaVLMClient
 
 
 def test_extract_json_pure():
@@ -76,6 +78,19 @@ def test_extract_json_braces_in_string():
     assert result["rationale"] == "Text with {braces} inside"
 
 
+def test_extract_json_skips_invalid_leading_brace():
+    """Test that a failed decode moves on to the next '{' in the text."""
+    client = OllamaVLMClient()
+    
+    text = 'Plan {step 1} then {"action": "explore", "navigation_goal": {"type": "node_id", "extra": {"k": 1}}}'
+    result = client._extract_json(text)
+    
+    assert result is not None
+    assert result["navigation_goal"]["extra"] == {"k": 1}
+    
+    # NaN is not valid JSON and must not slip past the confidence bounds
+    assert client._extract_json('{"confidence": NaN}') is None
+
 def test_extract_json_invalid():
     """Test JSON extraction returns None for invalid JSON."""
     client = OllamaVLMClient()
@@ -221,3 +236,279 @@ def test_ollama_error_payload():
         assert hypothesis is None
         assert "ollama_error" in meta["vlm_error"]
 
+
+
+class _FakeStreamResponse:
+    """Minimal http.client.HTTPResponse stand-in streaming NDJSON lines."""
+    
+    def __init__(self, pieces, status=200):
+        self.status = status
+        self.will_close = False
+        self.lines = [json.dumps({"response": p, "done": False}).encode() + b"\n" for p in pieces]
+        self.lines.append(json.dumps({"response": "", "done": True}).encode() + b"\n")
+        self.consumed = []
+    
+    def __iter__(self):
+        for line in self.lines:
+            self.consumed.append(line)
+            yield line
+    
+    def read(self):
+        return b""
+
+
+class _FakeConnection:
+    """Minimal http.client.HTTPConnection stand-in serving canned responses."""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+        self.bodies = []
+        self.closed = False
+    
+    def request(self, method, path, body=None, headers=None):
+        assert (method, path) == ("POST", "/api/generate")
+        self.requests += 1
+        self.bodies.append(body)
+    
+    def getresponse(self):
+        return self.responses.pop(0)
+    
+    def close(self):
+        self.closed = True
+
+
+def test_call_ollama_api_stops_after_first_object():
+    """Test that a stream still generating after the first object is cut off."""
+    client = OllamaVLMClient()
+    pieces = ['Here: {"action": "explore", ', '"rationale": "a } in a string"', '}']
+    pieces += [' trailing'] * 10
+    response = _FakeStreamResponse(pieces)
+    conn = _FakeConnection([response])
+    client._conn = conn
+    
+    text, error = client._call_ollama_api("prompt")
+    
+    assert error is None
+    assert text == 'Here: {"action": "explore", "rationale": "a } in a string"}'
+    assert len(response.consumed) == 3 + _DONE_GRACE_LINES
+    assert client._extract_json(text) == {"action": "explore", "rationale": "a } in a string"}
+    # Abandoning the stream closes the connection so generation stops
+    assert conn.closed and client._conn is None
+
+
+def test_call_ollama_api_keeps_connection_after_object():
+    """Test that a stream finishing right after its object keeps the connection."""
+    client = OllamaVLMClient()
+    response = _FakeStreamResponse(['{"action": ', '"explore"}', '\n'])
+    conn = _FakeConnection([response])
+    client._conn = conn
+    
+    text, error = client._call_ollama_api("prompt")
+    
+    assert (text, error) == ('{"action": "explore"}', None)
+    assert len(response.consumed) == 4
+    assert not conn.closed and client._conn is conn
+
+
+def test_call_ollama_api_skips_invalid_leading_brace():
+    """Test that streaming keeps reading past a balanced span that is not JSON."""
+    client = OllamaVLMClient()
+    hypothesis = {
+        "target_status": "not_visible",
+        "action": "explore",
+        "confidence": 0.6,
+        "rationale": "Searching"
+    }
+    pieces = ['I considered {goal} first. ', json.dumps(hypothesis), ' trailing']
+    response = _FakeStreamResponse(pieces)
+    client._conn = _FakeConnection([response])
+    
+    text, error = client._call_ollama_api("prompt")
+    
+    assert error is None
+    assert text == pieces[0] + pieces[1]
+    assert client._extract_json(text) == hypothesis
+
+
+def test_call_ollama_api_reuses_connection():
+    """Test that a completed stream keeps the connection for the next call."""
+    client = OllamaVLMClient()
+    first = _FakeStreamResponse(["no json", " here"])
+    conn = _FakeConnection([first, _FakeStreamResponse(["again"])])
+    client._conn = conn
+    
+    assert client._call_ollama_api("prompt") == ("no json here", None)
+    assert len(first.consumed) == 3
+    assert client._call_ollama_api("prompt") == ("again", None)
+    assert conn.requests == 2 and not conn.closed
+    
+    client.close()
+    assert conn.closed and client._conn is None
+
+
+def test_call_ollama_api_request_body():
+    """Test that the pre-serialized request body is the full JSON payload."""
+    client = OllamaVLMClient(model="test-model")
+    conn = _FakeConnection([_FakeStreamResponse(["ok"])])
+    client._conn = conn
+    
+    prompt = 'Say "hi" {now}\n\u00e9'
+    client._call_ollama_api(prompt)
+    
+    assert json.loads(conn.bodies[0]) == {
+        "model": "test-model",
+        "prompt": prompt,
+        "stream": True,
+        "format": "json",
+        "options": {"temperature": 0.2}
+    }
+
+def test_call_ollama_api_error_status():
+    """Test that an HTTP error status with a JSON body is an ollama_error."""
+    client = OllamaVLMClient()
+    response = _FakeStreamResponse([], status=404)
+    response.read = lambda: b'{"error": "model not found"}'
+    client._conn = _FakeConnection([response])
+    
+    assert client._call_ollama_api("prompt") == (None, "ollama_error:model not found")
+    assert client._conn is None
+
+
+def test_propose_hypotheses_batch_preserves_order():
+    """Test that batch generation returns one result per context, in order."""
+    client = OllamaVLMClient(max_retries=0)
+    
+    def fake_api(prompt):
+        if "goal-bad" in prompt:
+            return ('not json', None)
+        return (json.dumps({
+            "target_status": "not_visible",
+            "action": "explore",
+            "confidence": 0.6,
+            "rationale": "goal-a" if "goal-a" in prompt else "goal-b"
+        }), None)
+    
+    contexts = [
+        {
+            "goal_text": goal,
+            "active_constraints": [],
+            "belief_target_status": "searching",
+            "candidate_nodes": [],
+            "memory_context": []
+        }
+        for goal in ("goal-a", "goal-bad", "goal-b")
+    ]
+    
+    with patch.object(client, '_call_ollama_api', side_effect=fake_api):
+        results = client.propose_hypotheses_batch(contexts, max_workers=3)
+    
+    assert [h and h["rationale"] for h, _ in results] == ["goal-a", None, "goal-b"]
+    assert [meta["vlm_error"] for _, meta in results] == [None, "json_extraction_failed", None]
+
+
+@pytest.mark.parametrize("trailing, max_opened", [
+    ([], 2),  # stream ends at the object: connections reused
+    ([" more"] * (_DONE_GRACE_LINES + 1), 6),  # still generating: cut off per item
+])
+def test_propose_hypotheses_batch_worker_connections(trailing, max_opened):
+    """Test batch connection reuse for valid hypotheses, all closed at the end."""
+    client = OllamaVLMClient(max_retries=0)
+    valid_json = json.dumps({
+        "target_status": "not_visible",
+        "action": "explore",
+        "confidence": 0.6,
+        "rationale": "Searching"
+    })
+    opened = []
+    
+    def connect(host, port, timeout=None):
+        conn = _FakeConnection([_FakeStreamResponse([valid_json] + trailing) for _ in range(6)])
+        opened.append(conn)
+        return conn
+    
+    client._connection_class = connect
+    contexts = [
+        {
+            "goal_text": f"goal-{i}",
+            "active_constraints": [],
+            "belief_target_status": "searching",
+            "candidate_nodes": [],
+            "memory_context": []
+        }
+        for i in range(6)
+    ]
+    
+    results = client.propose_hypotheses_batch(contexts, max_workers=2)
+    
+    assert all(h is not None for h, _ in results)
+    assert 1 <= len(opened) <= max_opened
+    assert sum(conn.requests for conn in opened) == 6
+    assert all(conn.closed for conn in opened)
+
+
+def test_propose_hypothesis_cache():
+    """Test that a repeated prompt is served from the LRU cache."""
+    client = OllamaVLMClient(cache_size=1)
+    
+    valid_json = json.dumps({
+        "target_status": "not_visible",
+        "action": "explore",
+        "confidence": 0.6,
+        "rationale": "Searching"
+    })
+    context = {
+        "goal_text": "test",
+        "active_constraints": [],
+        "belief_target_status": "searching",
+        "candidate_nodes": [],
+        "memory_context": []
+    }
+    
+    with patch.object(client, '_call_ollama_api', return_value=(valid_json, None)) as mock_api:
+        first, first_meta = client.propose_hypothesis(context)
+        first["action"] = "mutated"
+        second, second_meta = client.propose_hypothesis(context)
+        
+        assert mock_api.call_count == 1
+        assert second["action"] == "explore"
+        assert first_meta["vlm_cache_hit"] is False
+        assert second_meta["vlm_cache_hit"] is True
+        assert second_meta["vlm_latency_ms"] == 0.0
+        
+        # A different prompt evicts the only entry
+        client.propose_hypothesis({**context, "goal_text": "other"})
+        client.propose_hypothesis(context)
+        assert mock_api.call_count == 3
+        assert (client.cache_hits, client.cache_misses) == (1, 3)
+
+
+def test_propose_hypothesis_cache_after_retry():
+    """Test that a success after a retry is cached under the original prompt."""
+    client = OllamaVLMClient(max_retries=1, cache_size=4)
+    
+    valid_json = json.dumps({
+        "target_status": "not_visible",
+        "action": "explore",
+        "confidence": 0.6,
+        "rationale": "Searching"
+    })
+    context = {
+        "goal_text": "test",
+        "active_constraints": [],
+        "belief_target_status": "searching",
+        "candidate_nodes": [],
+        "memory_context": []
+    }
+    
+    with patch.object(client, '_call_ollama_api') as mock_api:
+        mock_api.side_effect = [('invalid json {', None), (valid_json, None)]
+        first, first_meta = client.propose_hypothesis(context)
+        second, second_meta = client.propose_hypothesis(context)
+    
+    assert first_meta["vlm_retry_count"] == 1
+    assert mock_api.call_count == 2
+    assert second == first
+    assert second_meta["vlm_cache_hit"] is True
+    assert client.cache_hits == 1
+    assert list(client._cache) == [client._build_prompt(context)]
@@ -6,18 +6,18 @@ from perception import config as perception_config
 from perception.check_visibility import check_visibility
 
 
-def test_check_visibility_node_oracle_map(monkeypatch):
+def test_check_visibility_node_oracle_map():
     """Test that oracle map lookup works correctly."""
-    # Set up oracle map
-    test_oracle_map = {5: 0.9, 7: 0.75}
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", test_oracle_map)
+    # Set up oracle map (injected via config, global map untouched)
+    oracle_config = {"oracle_map": {5: 0.9, 7: 0.75}}
     
     # Test case 1: node in oracle map
     result = check_visibility(
         goal_text="red backpack",
         current_node_id=5,
         memory_context=[],
-        belief_state={}
+        belief_state={},
+        config=oracle_config
     )
     
     assert result["is_visible"] is True
@@ -34,7 +34,8 @@ def test_check_visibility_node_oracle_map(monkeypatch):
         goal_text="red backpack",
         current_node_id=6,
         memory_context=[],
-        belief_state={}
+        belief_state={},
+        config=oracle_config
     )
     
     assert result["is_visible"] is False
@@ -48,7 +49,8 @@ def test_check_visibility_node_oracle_map(monkeypatch):
         goal_text="red backpack",
         current_node_id=None,
         memory_context=[],
-        belief_state={}
+        belief_state={},
+        config=oracle_config
     )
     
     assert result["is_visible"] is False
@@ -93,12 +95,9 @@ def test_check_visibility_backend_override():
     assert result["evidence"]["reason"] == "unknown_backend"
 
 
-def test_check_visibility_config_override(monkeypatch):
+def test_check_visibility_config_override():
     """Test that config override works (for testing)."""
-    # Set global map to something different
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {1: 0.5})
-    
-    # Override with custom config
+    # Global map is empty by default; only the override can produce a hit
     custom_oracle_map = {10: 0.95}
     result = check_visibility(
         goal_text="red backpack",
@@ -113,23 +112,175 @@ def test_check_visibility_config_override(monkeypatch):
     assert result["evidence"]["reason"] == "oracle_hit"
 
 
-def test_get_node_oracle_map_returns_copy(monkeypatch):
+def test_check_visibility_global_oracle_map_default(monkeypatch):
+    """Test that NODE_ORACLE_MAP applies when no config is passed."""
+    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {1: 0.5})
+    
+    result = check_visibility(
+        goal_text="red backpack",
+        current_node_id=1,
+        memory_context=[],
+        belief_state={}
+    )
+    
+    assert result["is_visible"] is True
+    assert result["confidence"] == 0.5
+    
+    # An injected map takes precedence over the global one
+    result = check_visibility(
+        goal_text="red backpack",
+        current_node_id=1,
+        memory_context=[],
+        belief_state={},
+        config={"oracle_map": {10: 0.95}}
+    )
+    
+    assert result["is_visible"] is False
+    assert result["evidence"]["reason"] == "oracle_miss"
+
+
+def test_get_node_oracle_map_returns_copy():
     """Test that get_node_oracle_map returns a copy to prevent mutation."""
     from perception.config import get_node_oracle_map
     
-    # Set up oracle map
-    test_oracle_map = {5: 0.9}
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", test_oracle_map)
+    original = dict(perception_config.NODE_ORACLE_MAP)
     
     # Get copy
     oracle_copy = get_node_oracle_map()
+    assert oracle_copy is not perception_config.NODE_ORACLE_MAP
     
     # Mutate copy
     oracle_copy[99] = 0.5
     
     # Original should be unchanged
     assert 99 not in perception_config.NODE_ORACLE_MAP
-    assert perception_config.NODE_ORACLE_MAP == {5: 0.9}
+    assert perception_config.NODE_ORACLE_MAP == original
+
+
+def test_get_node_oracle_map_view_is_read_only(monkeypatch):
+    """Test that get_node_oracle_map_view returns a live read-only view."""
+    from perception.config import get_node_oracle_map_view
+    
+    test_oracle_map = {5: 0.9}
+    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", test_oracle_map)
+    
+    view = get_node_oracle_map_view()
+    assert view[5] == 0.9
+    with pytest.raises(TypeError):
+        view[99] = 0.5
+    
+    # In-place changes to the map show through the shared view
+    test_oracle_map[7] = 0.75
+    assert get_node_oracle_map_view() is view
+    assert view[7] == 0.75
+
+
+def test_get_node_oracle_relpose_map_is_read_only(monkeypatch):
+    """Test that get_node_oracle_relpose_map returns a read-only view."""
+    from perception.config import get_node_oracle_relpose_map
+    
+    test_relpose_map = {"find the chair": {5: {"distance_m": 1.0, "bearing_rad": 0.0}}}
+    monkeypatch.setattr(perception_config, "NODE_ORACLE_RELPOSE_MAP", test_relpose_map)
+    
+    view = get_node_oracle_relpose_map()
+    assert view["find the chair"][5]["distance_m"] == 1.0
+    
+    with pytest.raises(TypeError):
+        view["find the chair"][5]["distance_m"] = 2.0
+    with pytest.raises(TypeError):
+        view["find the chair"][99] = {}
+    
+    # Original is untouched and repeated calls share the view
+    assert test_relpose_map["find the chair"][5]["distance_m"] == 1.0
+    assert get_node_oracle_relpose_map() is view
+
+
+def test_set_relpose_map_normalizes_goal_keys(monkeypatch):
+    """Test that set_relpose_map pre-normalizes goal keys for lookup."""
+    from perception.config import get_node_oracle_relpose_map, set_relpose_map
+    
+    # Restore the original global after the test
+    monkeypatch.setattr(perception_config, "NODE_ORACLE_RELPOSE_MAP", {})
+    
+    view = set_relpose_map({
+        "Find the  RED Backpack ": {12: {"distance_m": 1.8, "bearing_rad": 0.2}},
+        "find the red backpack": {13: {"distance_m": 0.6, "bearing_rad": 0.0}}
+    })
+    
+    assert list(view) == ["find the red backpack"]
+    assert sorted(view["find the red backpack"]) == [12, 13]
+    assert get_node_oracle_relpose_map() is view
+    
+    result = check_visibility(
+        goal_text="find the red backpack",
+        current_node_id=12,
+        memory_context=[],
+        belief_state={},
+        backend="node_oracle_relpose"
+    )
+    
+    assert result["is_visible"] is True
+    assert result["distance_m"] == 1.8
+
+
+def test_flatten_relpose_map():
+    """Test relpose map flattening to (goal_key, node_id) tuple keys."""
+    from perception.config import flatten_relpose_map
+    
+    flat = flatten_relpose_map({
+        "find the chair": {
+            5: {"distance_m": 1.0, "bearing_rad": 0.1, "confidence": 0.8},
+            6: {"distance_m": 2.0, "bearing_rad": -0.1},
+            7: {}
+        }
+    })
+    
+    assert flat == {
+        ("find the chair", 5): (1.0, 0.1, 0.8),
+        ("find the chair", 6): (2.0, -0.1, None)
+    }
+
+
+def test_node_oracle_relpose_malformed_entry_isolated(monkeypatch):
+    """Test that one malformed relpose entry does not break other goals."""
+    relpose_map = {
+        "blue cup": {2: "bogus"},
+        "red backpack": {12: {"distance_m": 1.8, "bearing_rad": 0.2, "confidence": 0.9}}
+    }
+    monkeypatch.setattr(perception_config, "NODE_ORACLE_RELPOSE_MAP", relpose_map)
+    
+    for config in ({"relpose_map": relpose_map}, None):
+        for _ in range(2):
+            good = check_visibility(
+                goal_text="red backpack", current_node_id=12,
+                memory_context=[], belief_state={},
+                backend="node_oracle_relpose", config=config
+            )
+            assert good["evidence"]["reason"] == "relpose_hit"
+            assert good["distance_m"] == 1.8
+            
+            bad = check_visibility(
+                goal_text="blue cup", current_node_id=2,
+                memory_context=[], belief_state={},
+                backend="node_oracle_relpose", config=config
+            )
+            assert bad["is_visible"] is False
+            assert bad["evidence"]["reason"] == "exception"
+
+
+def test_node_oracle_relpose_config_map_mutated_in_place():
+    """Test that entries added in place to a config map after a lookup are found."""
+    config = {"relpose_map": {
+        "red backpack": {1: {"distance_m": 1.0, "bearing_rad": 0.0, "confidence": 0.9}}
+    }}
+    check_visibility("red backpack", 1, [], {}, backend="node_oracle_relpose", config=config)
+    config["relpose_map"]["red backpack"][2] = {"distance_m": 0.5, "bearing_rad": 0.1, "confidence": 0.8}
+    
+    result = check_visibility("red backpack", 2, [], {}, backend="node_oracle_relpose", config=config)
+    
+    assert result["is_visible"] is True
+    assert result["evidence"]["reason"] == "relpose_hit"
+    assert result["distance_m"] == 0.5
 
 
 def test_node_oracle_relpose_backend_hit():
@@ -237,3 +388,90 @@ def test_backward_compatibility_distance_none():
     assert result["distance_m"] is None  # No distance for classic backend
     assert result["bearing_rad"] is None
     assert result["target_goal_key"] is None
+
+
+def test_node_oracle_none_fast_path_matches_handler():
+    """Test that the current_node_id=None fast path matches the full handler."""
+    from perception.check_visibility import _handle_node_oracle
+    from perception.types import VisibilityResult
+    
+    expected = VisibilityResult(backend="node_oracle", node_id=None)
+    _handle_node_oracle(expected, "test", None, None)
+    
+    first = check_visibility("test", None, [], {})
+    assert first == expected.as_dict()
+    
+    # Each call gets its own nested dicts
+    first["evidence"]["extra"]["note"] = "mutated"
+    assert check_visibility("test", None, [], {}) == expected.as_dict()
+
+
+def test_measure_latency_false_skips_timer(monkeypatch):
+    """Test that measure_latency=False reports 0 without reading the clock."""
+    from perception import check_visibility as cv_module
+    
+    def no_clock():
+        raise AssertionError("perf_counter_ns should not be called")
+    
+    monkeypatch.setattr(cv_module.time, "perf_counter_ns", no_clock)
+    oracle_config = {"oracle_map": {5: 0.9}}
+    
+    result = check_visibility("test", 5, [], {}, config=oracle_config, measure_latency=False)
+    
+    assert result["latency_ms"] == 0
+    assert result["is_visible"] is True
+    assert result["confidence"] == 0.9
+
+
+def test_sampled_timing_reports_zero_when_skipped(monkeypatch):
+    """Test that calls skipped by sampling report 0, not a stale latency."""
+    import itertools
+    
+    from perception import check_visibility as cv_module
+    
+    clock = itertools.count(step=7_000_000)  # every read advances 7 ms
+    monkeypatch.setattr(cv_module.time, "perf_counter_ns", lambda: next(clock))
+    monkeypatch.setattr(cv_module, "_TIMING_EVERY", 2)
+    monkeypatch.setattr(cv_module, "_timing_ticks", itertools.count())
+    oracle_config = {"oracle_map": {5: 0.9}}
+    
+    latencies = [
+        check_visibility("test", 5, [], {}, config=oracle_config)["latency_ms"]
+        for _ in range(4)
+    ]
+    
+    assert latencies == [7, 0, 7, 0]
+
+
+def test_parse_timing_every_tolerates_bad_values():
+    """Test that a malformed PERCEPTION_TIMING_EVERY falls back to 1."""
+    from perception.check_visibility import _parse_timing_every
+    
+    assert _parse_timing_every(None) == 1
+    assert _parse_timing_every("4") == 4
+    assert _parse_timing_every("0") == 1
+    assert _parse_timing_every("every") == 1
+    assert _parse_timing_every("2.5") == 1
+
+
+def test_dense_oracle_map_matches_dict(monkeypatch):
+    """Test that DenseOracleMap gives the same visibility as the dict map."""
+    from perception.config import DenseOracleMap, get_node_oracle_map
+    
+    oracle_map = {2: 0.9, 5: 0.0, 7: 0.75}
+    dense = DenseOracleMap.from_dict(oracle_map, num_nodes=10)
+    
+    assert dict(dense) == oracle_map
+    assert len(dense) == 3 and 5 in dense and 3 not in dense and 99 not in dense
+    
+    for node_id in [None, 0, 2, 5, 7, 9, 10, -1]:
+        expected = check_visibility("test", node_id, [], {}, config={"oracle_map": oracle_map})
+        actual = check_visibility("test", node_id, [], {}, config={"oracle_map": dense})
+        expected.pop("latency_ms")
+        actual.pop("latency_ms")
+        assert actual == expected
+    
+    # Also usable as the global map
+    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", dense)
+    assert check_visibility("test", 7, [], {})["confidence"] == 0.75
+    assert get_node_oracle_map() == oracle_map
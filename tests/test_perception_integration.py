@@ -5,16 +5,15 @@ import random
 
 import pytest
 
-from perception import config as perception_config
 from planner.verifier_stub import VerifierStub
-from runtime.loop import initialize_belief_state, load_schemas
+from runtime.loop import initialize_belief_state
 from runtime.schema_loader import validate_or_error
 from vlm.fallback import generate_fallback_hypothesis
 
 
-def test_action_simulation_goto_node():
+def test_action_simulation_goto_node(schemas):
     """Test that goto_node action updates current_node_id."""
-    _, _, _, belief_validator = load_schemas()
+    belief_validator = schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # Set up a goto_node action via last_vlm_hypothesis
@@ -40,9 +39,9 @@ def test_action_simulation_goto_node():
     assert belief["current_node_id"] == 5
 
 
-def test_action_simulation_fallback_goto_node():
+def test_action_simulation_fallback_goto_node(schemas):
     """Test that fallback-generated goto_node also updates current_node_id."""
-    _, _, _, belief_validator = load_schemas()
+    belief_validator = schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # Generate fallback hypothesis with candidates
@@ -67,14 +66,14 @@ def test_action_simulation_fallback_goto_node():
     assert belief["current_node_id"] == 7
 
 
-def test_visibility_hysteresis_k2(monkeypatch):
+def test_visibility_hysteresis_k2(schemas):
     """Test that visibility requires K=2 consecutive hits."""
     from perception.check_visibility import check_visibility
     
     # Set up oracle map with node 5 visible
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {5: 0.9})
+    oracle_config = {"oracle_map": {5: 0.9}}
     
-    _, _, _, belief_validator = load_schemas()
+    belief_validator = schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # Move to node 5
@@ -85,7 +84,8 @@ def test_visibility_hysteresis_k2(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     assert vr["is_visible"] is True
@@ -110,7 +110,8 @@ def test_visibility_hysteresis_k2(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     assert vr["is_visible"] is True
@@ -135,12 +136,12 @@ def test_visibility_hysteresis_k2(monkeypatch):
     assert belief["visible_since_step"] == 1
 
 
-def test_vlm_cannot_force_visible_or_done(monkeypatch):
+def test_vlm_cannot_force_visible_or_done(schemas):
     """Test that VLM hypothesis cannot directly set visible/done."""
     # Set up oracle map with no visible nodes
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {})
+    oracle_config = {"oracle_map": {}}
     
-    _, _, vlm_validator, belief_validator = load_schemas()
+    vlm_validator, belief_validator = schemas.vlm_validator, schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # Create a VLM hypothesis that tries to set target_status to "visible"
@@ -180,7 +181,8 @@ def test_vlm_cannot_force_visible_or_done(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     # Perception says not visible (oracle map is empty)
@@ -190,14 +192,14 @@ def test_vlm_cannot_force_visible_or_done(monkeypatch):
     assert belief["target_status"] == "searching"
 
 
-def test_visible_to_done_transition(monkeypatch):
+def test_visible_to_done_transition(schemas):
     """Test visible -> done transition with guard."""
     from perception.check_visibility import check_visibility
     
     # Set up oracle map
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {5: 0.9})
+    oracle_config = {"oracle_map": {5: 0.9}}
     
-    _, _, _, belief_validator = load_schemas()
+    belief_validator = schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # Manually set belief to visible state (as if it transitioned earlier)
@@ -215,7 +217,8 @@ def test_visible_to_done_transition(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     assert vr["is_visible"] is True
@@ -245,7 +248,8 @@ def test_visible_to_done_transition(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     assert vr["is_visible"] is True
@@ -268,14 +272,14 @@ def test_visible_to_done_transition(monkeypatch):
     assert belief["target_status"] == "done"
 
 
-def test_visible_to_done_requires_perception_visible(monkeypatch):
+def test_visible_to_done_requires_perception_visible(schemas):
     """Test that done transition requires perception to still see the target."""
     from perception.check_visibility import check_visibility
     
     # Set up oracle map (empty, so perception will return not visible)
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {})
+    oracle_config = {"oracle_map": {}}
     
-    _, _, _, belief_validator = load_schemas()
+    belief_validator = schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # Set belief to visible state
@@ -292,7 +296,8 @@ def test_visible_to_done_requires_perception_visible(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     # Perception says NOT visible (oracle map empty)
@@ -316,14 +321,14 @@ def test_visible_to_done_requires_perception_visible(monkeypatch):
     assert belief["target_status"] == "visible"  # Still visible, not done
 
 
-def test_streak_resets_on_not_visible(monkeypatch):
+def test_streak_resets_on_not_visible(schemas):
     """Test that visibility streak resets when perception returns not visible."""
     from perception.check_visibility import check_visibility
     
     # Set up oracle map
-    monkeypatch.setattr(perception_config, "NODE_ORACLE_MAP", {5: 0.9})
+    oracle_config = {"oracle_map": {5: 0.9}}
     
-    _, _, _, belief_validator = load_schemas()
+    belief_validator = schemas.belief_validator
     belief = initialize_belief_state(belief_validator)
     
     # First hit at node 5
@@ -332,7 +337,8 @@ def test_streak_resets_on_not_visible(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     assert vr["is_visible"] is True
@@ -344,7 +350,8 @@ def test_streak_resets_on_not_visible(monkeypatch):
         goal_text=belief["goal_text"],
         current_node_id=belief["current_node_id"],
         memory_context=[],
-        belief_state=belief
+        belief_state=belief,
+        config=oracle_config
     )
     
     assert vr["is_visible"] is False
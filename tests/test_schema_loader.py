@@ -0,0 +1,88 @@
+"""Tests for schema loading and validation."""
+
+import json
+
+import pytest
+
+from runtime import _vlm_validator_gen, schema_loader
+from runtime.generate_validator import is_current
+from runtime.loop import _MOCK_INVALID_POOL, _MOCK_VALID_POOL, initialize_belief_state
+from runtime.schema_loader import load_validators, validate_or_error
+
+
+def test_compiled_fast_path_matches_jsonschema(monkeypatch):
+    """Test that the compiled fast path gives the same results as jsonschema."""
+    bundle = load_validators()
+    if not schema_loader._COMPILED:
+        pytest.skip("no compiled validators (generated validator is stale)")
+    belief = initialize_belief_state(bundle.belief_validator)
+    cases = [(bundle.vlm_validator, hyp) for hyp in _MOCK_VALID_POOL + _MOCK_INVALID_POOL]
+    for hyp in _MOCK_VALID_POOL + _MOCK_INVALID_POOL:
+        cases.append((bundle.belief_validator, dict(belief, last_vlm_hypothesis=hyp)))
+    
+    fast = [validate_or_error(validator, instance) for validator, instance in cases]
+    monkeypatch.setattr(schema_loader, "_COMPILED", {})
+    slow = [validate_or_error(validator, instance) for validator, instance in cases]
+    
+    assert fast == slow
+    assert any(is_valid for is_valid, _ in fast)
+    assert not all(is_valid for is_valid, _ in fast)
+
+
+def test_compiled_check_requires_same_validator(monkeypatch):
+    """Test that a compiled check is not used for another validator at its id."""
+    from jsonschema import Draft7Validator
+    
+    bundle = load_validators()
+    other = Draft7Validator({"type": "object", "required": ["action"]})
+    
+    def accept_all(instance):
+        return instance
+    
+    # Simulate a stale entry whose id now belongs to a different validator
+    monkeypatch.setitem(
+        schema_loader._COMPILED, id(other),
+        schema_loader._CompiledCheck(bundle.vlm_validator, accept_all)
+    )
+    
+    is_valid, error_info = validate_or_error(other, {})
+    assert is_valid is False
+    assert error_info["path"] == []
+
+
+def test_belief_schema_refs_are_inlined():
+    """Test that the belief validator carries no $ref after loading."""
+    belief_validator = load_validators().belief_validator
+    
+    assert "$ref" not in json.dumps(belief_validator.schema)
+    
+    with pytest.raises(ValueError):
+        schema_loader._inline_refs({"$ref": "missing.json"}, "file:///schemas/a.json", {})
+    
+    # Draft 7 ignores keywords next to a $ref
+    store = {"file:///schemas/b.json": {"type": "integer"}}
+    inlined = schema_loader._inline_refs(
+        {"$ref": "b.json", "maximum": 3}, "file:///schemas/a.json", store
+    )
+    assert inlined == {"type": "integer"}
+
+
+def test_generated_vlm_validator_is_current():
+    """Test that the generated VLM validator matches the schema file and is used."""
+    assert is_current(), "run: python -m runtime.generate_validator"
+    
+    vlm_validator = load_validators().vlm_validator
+    assert schema_loader._COMPILED[id(vlm_validator)].check is _vlm_validator_gen.validate
+    
+    for hyp in _MOCK_VALID_POOL:
+        _vlm_validator_gen.validate(hyp)
+    for hyp in _MOCK_INVALID_POOL:
+        with pytest.raises(ValueError):
+            _vlm_validator_gen.validate(hyp)
+
+
+def test_initial_belief_state_is_schema_valid():
+    """Test the initial belief literal (validated in main() only without -O)."""
+    belief_validator = load_validators().belief_validator
+    
+    assert validate_or_error(belief_validator, initialize_belief_state(belief_validator)) == (True, None)
@@ -3,7 +3,61 @@
 Provides deterministic fallback when VLM generation fails or is unavailable.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+# Per-case hypothesis templates; generate_fallback_hypothesis returns copies
+# (with fresh navigation_goal dicts) so callers may mutate the result
+_DONE_TEMPLATE = {
+    "target_status": "visible",
+    "action": "stop",
+    "confidence": 0.9,
+    "rationale": "Goal completed"
+}
+_APPROACH_TEMPLATE = {
+    "target_status": "visible",
+    "action": "approach",
+    "confidence": 0.7,
+    "rationale": "Approaching visible target"
+}
+_APPROACH_GOAL = {
+    "type": "pose_relative",
+    "distance_meters": 1.0,
+    "angle_degrees": 0.0,
+    "standoff_distance": 0.5
+}
+_GOTO_NODE_TEMPLATE = {
+    "target_status": "not_visible",
+    "action": "goto_node",
+    "confidence": 0.5,
+    "rationale": "Navigating to candidate memory node"
+}
+_EXPLORE_TEMPLATE = {
+    "target_status": "not_visible",
+    "action": "explore",
+    "confidence": 0.3,
+    "rationale": "Exploring for target"
+}
+
+
+def _stop_hypothesis() -> Dict[str, Any]:
+    """Fallback for target_status "done": stop."""
+    return _DONE_TEMPLATE.copy()
+
+
+def _approach_hypothesis() -> Dict[str, Any]:
+    """Fallback for target_status "visible": approach the target."""
+    hypothesis = _APPROACH_TEMPLATE.copy()
+    hypothesis["navigation_goal"] = _APPROACH_GOAL.copy()
+    return hypothesis
+
+
+# Belief target_status -> fallback builder for statuses that decide the
+# hypothesis on their own; other statuses fall through to goto_node/explore
+_STATUS_HANDLERS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "done": _stop_hypothesis,
+    "visible": _approach_hypothesis,
+}
 
 
 def generate_fallback_hypothesis(
@@ -25,51 +79,32 @@ def generate_fallback_hypothesis(
     Returns:
         Schema-valid VLMHypothesis dict
     """
-    target_status_belief = belief.get("target_status", "searching")
-    
-    # Case 1: Goal completed
-    if target_status_belief == "done":
-        return {
-            "target_status": "visible",
-            "action": "stop",
-            "confidence": 0.9,
-            "rationale": "Goal completed"
-        }
-    
-    # Case 2: Target is visible
-    if target_status_belief == "visible":
-        return {
-            "target_status": "visible",
-            "action": "approach",
-            "confidence": 0.7,
-            "rationale": "Approaching visible target",
-            "navigation_goal": {
-                "type": "pose_relative",
-                "distance_meters": 1.0,
-                "angle_degrees": 0.0,
-                "standoff_distance": 0.5
-            }
-        }
+    # Cases 1-2: goal completed / target visible
+    handler = _STATUS_HANDLERS.get(belief.get("target_status", "searching"))
+    if handler is not None:
+        return handler()
     
     # Case 3: Candidates available from memory
     if candidates:
-        top_candidate_id = candidates[0]["node_id"]
-        return {
-            "target_status": "not_visible",
-            "action": "goto_node",
-            "confidence": 0.5,
-            "rationale": "Navigating to candidate memory node",
-            "navigation_goal": {
-                "type": "node_id",
-                "node_id": top_candidate_id
-            }
-        }
+        hypothesis = _GOTO_NODE_TEMPLATE.copy()
+        hypothesis["navigation_goal"] = {"type": "node_id", "node_id": candidates[0]["node_id"]}
+        return hypothesis
     
     # Case 4: No information available, explore
-    return {
-        "target_status": "not_visible",
-        "action": "explore",
-        "confidence": 0.3,
-        "rationale": "Exploring for target"
-    }
+    return _EXPLORE_TEMPLATE.copy()
 
+
+def generate_fallback_hypothesis_batch(
+    pairs: Iterable[Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """Generate fallback hypotheses for several (belief, candidates) pairs.
+    
+    Args:
+        pairs: Iterable of (belief, candidates) tuples.
+    
+    Returns:
+        One hypothesis per pair, in order, each equal to
+        generate_fallback_hypothesis(belief, candidates).
+    """
+    generate = generate_fallback_hypothesis
+    return [generate(belief, candidates) for belief, candidates in pairs]
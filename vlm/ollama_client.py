@@ -4,15 +4,197 @@ Calls local Ollama API (qwen2.5vl:7b) to generate VLMHypothesis JSON.
 Schema-first validation with robust error handling and safe fallback.
 """
 
+import copy
+import http.client
 import json
 import re
+import threading
 import time
-import urllib.request
-import urllib.error
-from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 
 from runtime.schema_loader import load_hypothesis_validator, validate_or_error
 
+try:
+    # Optional: fast C JSON parser; orjson.JSONDecodeError subclasses
+    # json.JSONDecodeError, so the except clauses below cover both
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Compiled once: JSON inside a ```json fenced block
+_CODE_FENCE_RE = re.compile(r"```json\s*\n(.*?)\n```", re.DOTALL)
+
+
+def _reject_constant(name: str) -> None:
+    """Reject NaN/Infinity literals, which are not valid JSON (as orjson)."""
+    raise ValueError(f"invalid JSON constant: {name}")
+
+
+# C-accelerated decoder that parses one object and reports where it ends
+_JSON_DECODER = json.JSONDecoder(parse_constant=_reject_constant)
+# Characters the balanced-brace scan must inspect; everything else is skipped
+_BRACE_SCAN_RE = re.compile(r'[{}"\\]')
+
+# Lines read after the first complete object while waiting for "done"
+_DONE_GRACE_LINES = 4
+
+# Headers sent with every /api/generate request
+_REQUEST_HEADERS = {"Content-Type": "application/json"}
+
+# Raised when the server has dropped an idle kept-alive connection
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError
+)
+
+
+# Static parts of the generation prompts, built once at import; only the
+# context block of _build_prompt() varies per call
+_PROMPT_HEADER = """You are a navigation assistant. Output ONLY valid JSON, no other text.
+
+Required schema:
+- target_status: one of ["visible", "not_visible", "ambiguous"] (OUTPUT field - different from belief status)
+- action: one of ["approach", "explore", "rotate", "goto_node", "ask_clarification", "stop"]
+- confidence: number in [0.0, 1.0]
+- rationale: string (max 240 chars)
+
+Conditional requirements:
+- If action="goto_node": must include navigation_goal with type="node_id" and node_id (integer)
+- If action="approach": must include navigation_goal with type="pose_relative", distance_meters, angle_degrees, standoff_distance
+- If action="ask_clarification": must include clarification_question (string, max 160 chars)
+
+Current context:
+"""
+_BELIEF_STATUS_NOTE = (
+    '(for reference only - OUTPUT target_status must be ONLY one of '
+    '["visible","not_visible","ambiguous"])'
+)
+_REPAIR_PROMPT = """You returned invalid JSON. Output ONLY valid JSON with no extra text.
+
+Required schema:
+- target_status: one of ["visible", "not_visible", "ambiguous"]
+- action: one of ["approach", "explore", "rotate", "goto_node", "ask_clarification", "stop"]
+- confidence: number in [0.0, 1.0]
+- rationale: string (max 240 chars)
+
+Conditional requirements:
+- If action="goto_node": must include navigation_goal with type="node_id" and node_id (integer)
+- If action="approach": must include navigation_goal with type="pose_relative", distance_meters, angle_degrees, standoff_distance
+- If action="ask_clarification": must include clarification_question (string, max 160 chars)
+
+Output valid JSON now:"""
+
+
+def _format_memory_line(node_ctx: Dict[str, Any]) -> str:
+    """Format one memory context entry as a prompt line."""
+    tags = node_ctx.get("tags", [])
+    tags_str = ", ".join(tags) if tags else "none"
+    return (
+        f"  - node_id={node_ctx.get('node_id', '?')}, score={node_ctx.get('score', 0.0):.2f}, "
+        f"tags=[{tags_str}], summary=\"{node_ctx.get('summary', '')}\"\n"
+    )
+
+
+class _BraceScanner:
+    """Incremental, string-safe scan for the first balanced {...} object.
+    
+    Text is fed in chunks (e.g. streamed tokens); feed() reports the end of
+    the first top-level object as soon as its closing brace arrives. Braces
+    inside strings and escaped characters are ignored, even across chunks.
+    
+    Attributes:
+        start: Absolute index of the first '{', or None if not seen yet.
+        end: Absolute index just past the matching '}', or None.
+    """
+    
+    def __init__(self) -> None:
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._skip_next = False
+    
+    def feed(self, chunk: str) -> Optional[int]:
+        """Scan the next chunk of text.
+        
+        Args:
+            chunk: Text following everything fed so far
+        
+        Returns:
+            Absolute end index of the first balanced object once complete,
+            None while it is still open (or not started)
+        """
+        if self.end is not None:
+            return self.end
+        base = self._offset
+        self._offset += len(chunk)
+        pos = 0
+        
+        if self.start is None:
+            pos = chunk.find('{')
+            if pos == -1:
+                return None
+            self.start = base + pos
+        elif self._skip_next and chunk:
+            # Escaped character carried over from the previous chunk
+            self._skip_next = False
+            pos = 1
+        
+        # Jump straight to the next brace, quote or backslash instead of
+        # visiting every character
+        search = _BRACE_SCAN_RE.search
+        while True:
+            match = search(chunk, pos)
+            if match is None:
+                return None
+            i = match.start()
+            char = chunk[i]
+            pos = i + 1
+            
+            if char == '\\':
+                if pos < len(chunk):
+                    pos += 1  # Skip the escaped character
+                else:
+                    self._skip_next = True
+                continue
+            
+            if char == '"':
+                self._in_string = not self._in_string
+                continue
+            
+            # Only count braces when not in string
+            if not self._in_string:
+                if char == '{':
+                    self._depth += 1
+                elif char == '}':
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self.end = base + i + 1
+                        return self.end
+    
+    def restart(self, text: str) -> Optional[int]:
+        """Drop the current object and rescan from just after its '{'.
+        
+        Used when the balanced span found so far is not valid JSON, so the
+        scan moves on to the next candidate the way _extract_json() does.
+        
+        Args:
+            text: Everything fed so far, joined
+        
+        Returns:
+            As for feed(), for the next candidate object
+        """
+        resume = self.start + 1
+        self.__init__()
+        self._offset = resume
+        return self.feed(text[resume:])
+
 
 class OllamaVLMClient:
     """Client for generating VLM hypotheses using Ollama API."""
@@ -22,7 +204,8 @@ class OllamaVLMClient:
         base_url: str = "http://localhost:11434",
         model: str = "qwen2.5vl:7b",
         timeout_s: float = 30.0,
-        max_retries: int = 1
+        max_retries: int = 1,
+        cache_size: int = 0
     ):
         """Initialize Ollama VLM client.
         
@@ -31,12 +214,49 @@ class OllamaVLMClient:
             model: Model name to use
             timeout_s: Request timeout in seconds
             max_retries: Maximum number of retries on invalid output
+            cache_size: Number of successful hypotheses to memoize by prompt,
+                so a repeated context skips the model call (0 disables)
         """
         self.base_url = base_url
         self.model = model
         self.timeout_s = timeout_s
         self.max_retries = max_retries
         
+        # A kept-alive HTTP connection, reused across retries and calls
+        parsed_url = urlsplit(base_url)
+        self._connection_class = (
+            http.client.HTTPSConnection if parsed_url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._host = parsed_url.hostname or "localhost"
+        self._port = parsed_url.port
+        self._generate_path = parsed_url.path.rstrip("/") + "/api/generate"
+        # (one per thread: http.client connections cannot be shared by the
+        # workers of propose_hypotheses_batch())
+        self._local = threading.local()
+        
+        # Request fields other than the prompt never change, so they are
+        # serialized once; each call only encodes the prompt string
+        # format=json constrains the output to one JSON value, so
+        # generation ends right after the object and the stream can finish
+        # cleanly (keeping the connection alive)
+        static_payload = {
+            "model": model,
+            "stream": True,
+            "format": "json",
+            "options": {
+                "temperature": 0.2
+            }
+        }
+        self._body_prefix = json.dumps(static_payload)[:-1].encode("utf-8") + b', "prompt": '
+        
+        # LRU cache of successful results keyed by prompt (disabled when 0)
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Load schema validator (Windows-safe, reuses same pattern as loop.py)
         self.validator = load_hypothesis_validator()
     
@@ -58,7 +278,8 @@ class OllamaVLMClient:
             Tuple of (hypothesis_dict | None, meta_dict).
             hypothesis_dict is None if generation failed or output invalid.
             meta_dict contains: vlm_backend, vlm_model, vlm_latency_ms,
-            vlm_parse_ok, vlm_schema_ok, vlm_retry_count, vlm_error
+            vlm_parse_ok, vlm_schema_ok, vlm_retry_count, vlm_error,
+            vlm_cache_hit
         """
         start_time = time.perf_counter()
         
@@ -69,12 +290,21 @@ class OllamaVLMClient:
             "vlm_parse_ok": False,
             "vlm_schema_ok": False,
             "vlm_retry_count": 0,
-            "vlm_error": None
+            "vlm_error": None,
+            "vlm_cache_hit": False
         }
         
         # Build prompt
         prompt = self._build_prompt(context)
         
+        # The first prompt determines the request, so it is the cache key
+        # (retries replace prompt with the shared repair prompt)
+        cache_key = prompt
+        if self.cache_size > 0:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+        
         # Try generation with retry
         for attempt in range(self.max_retries + 1):
             if attempt > 0:
@@ -119,6 +349,8 @@ class OllamaVLMClient:
             # Success!
             meta["vlm_schema_ok"] = True
             meta["vlm_latency_ms"] = (time.perf_counter() - start_time) * 1000
+            if self.cache_size > 0:
+                self._cache_put(cache_key, hypothesis_dict, meta)
             return hypothesis_dict, meta
         
         # Should not reach here, but handle edge case
@@ -126,9 +358,107 @@ class OllamaVLMClient:
         meta["vlm_latency_ms"] = (time.perf_counter() - start_time) * 1000
         return None, meta
     
+    def _cache_get(self, prompt: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Look up a memoized result, returning copies the caller may mutate.
+        
+        Args:
+            prompt: Prompt the result was generated for
+        
+        Returns:
+            (hypothesis_dict, meta_dict) with vlm_cache_hit=True and zero
+            latency, or None on a miss
+        """
+        with self._cache_lock:
+            entry = self._cache.get(prompt)
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(prompt)
+            self.cache_hits += 1
+        hypothesis_dict, meta = entry
+        return copy.deepcopy(hypothesis_dict), {**meta, "vlm_latency_ms": 0.0, "vlm_cache_hit": True}
+    
+    def _cache_put(self, prompt: str, hypothesis_dict: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        """Memoize a successful result, evicting the least recently used one."""
+        entry = (copy.deepcopy(hypothesis_dict), dict(meta))
+        with self._cache_lock:
+            self._cache[prompt] = entry
+            self._cache.move_to_end(prompt)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def propose_hypotheses_batch(
+        self,
+        contexts: Sequence[Dict[str, Any]],
+        max_workers: int = 4
+    ) -> List[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]:
+        """Generate hypotheses for several contexts concurrently.
+        
+        Each context goes through propose_hypothesis() (including its
+        retries) on a worker thread with its own HTTP connection, so the
+        requests overlap instead of running back to back. A worker reuses
+        its connection across the contexts it handles while streams end
+        cleanly (see _post_generate()); all worker connections are closed
+        once the batch is done.
+        
+        Args:
+            contexts: Context dicts, as for propose_hypothesis()
+            max_workers: Maximum number of concurrent requests
+        
+        Returns:
+            One (hypothesis_dict | None, meta_dict) tuple per context, in
+            input order.
+        """
+        if len(contexts) <= 1 or max_workers <= 1:
+            return [self.propose_hypothesis(context) for context in contexts]
+        
+        # Worker thread id -> its current connection, closed at shutdown
+        worker_conns: Dict[int, Optional[http.client.HTTPConnection]] = {}
+        
+        def propose_and_track(context):
+            try:
+                return self.propose_hypothesis(context)
+            finally:
+                worker_conns[threading.get_ident()] = self._conn
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(contexts))) as pool:
+                return list(pool.map(propose_and_track, contexts))
+        finally:
+            for conn in worker_conns.values():
+                if conn is not None:
+                    conn.close()
+    
+    @property
+    def _conn(self) -> Optional[http.client.HTTPConnection]:
+        """Kept-alive HTTP connection of the calling thread, if any."""
+        return getattr(self._local, "conn", None)
+    
+    @_conn.setter
+    def _conn(self, conn: Optional[http.client.HTTPConnection]) -> None:
+        self._local.conn = conn
+    
+    def close(self) -> None:
+        """Close this thread's kept-alive HTTP connection (safe to call more than once)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def __enter__(self) -> "OllamaVLMClient":
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+    
     def _call_ollama_api(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
         """Call Ollama /api/generate endpoint.
         
+        The response is streamed (one JSON line per generated chunk) and
+        reading stops as soon as the first top-level JSON object in the
+        generated text is complete, so the model is not left generating
+        trailing prose the caller would discard. The HTTP connection is
+        kept alive for the next call when the stream ran to completion.
+        
         Args:
             prompt: Prompt text to send
         
@@ -137,59 +467,129 @@ class OllamaVLMClient:
             If successful, returns (response_text, None).
             If failed, returns (None, error_msg).
         """
-        url = f"{self.base_url}/api/generate"
+        body = self._body_prefix + json.dumps(prompt).encode("utf-8") + b"}"
         
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.2
-            }
-        }
+        reused = self._conn is not None
+        try:
+            try:
+                return self._post_generate(body)
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # Server closed the idle connection; retry once on a fresh one
+                return self._post_generate(body)
+        except TimeoutError:
+            return None, "timeout"
+        except json.JSONDecodeError as e:
+            return None, f"response_parse_error:{str(e)}"
+        except (OSError, http.client.HTTPException) as e:
+            return None, f"connection_failed:{str(e)}"
+        except Exception as e:
+            return None, f"unexpected_error:{str(e)}"
+    
+    def _post_generate(self, body: bytes) -> Tuple[Optional[str], Optional[str]]:
+        """POST body to /api/generate and read the streamed response.
+        
+        The connection is closed unless the stream ended cleanly, so an
+        interrupted or failed exchange never leaves it half-read. Once the
+        first valid object is complete, up to _DONE_GRACE_LINES further
+        lines are read waiting for "done"; stopping earlier would close a
+        connection that is about to finish.
+        
+        Args:
+            body: Encoded JSON request payload
         
+        Returns:
+            Tuple of (response_text | None, error_msg | None), as for
+            _call_ollama_api(); transport errors propagate.
+        """
+        if self._conn is None:
+            self._conn = self._connection_class(self._host, self._port, timeout=self.timeout_s)
+        keep_alive = False
         try:
-            req = urllib.request.Request(
-                url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-                method="POST"
+            self._conn.request(
+                "POST",
+                self._generate_path,
+                body=body,
+                headers=_REQUEST_HEADERS
             )
+            response = self._conn.getresponse()
             
-            with urllib.request.urlopen(req, timeout=self.timeout_s) as response:
-                response_data = json.loads(response.read().decode("utf-8"))
+            if response.status >= 400:
+                # Ollama reports e.g. unknown models as a JSON error body
+                try:
+                    error_data = _json_loads(response.read())
+                except json.JSONDecodeError:
+                    error_data = None
+                if isinstance(error_data, dict) and "error" in error_data:
+                    return None, f"ollama_error:{error_data['error']}"
+                return None, f"http_error:{response.status}"
+            
+            pieces = []
+            scanner = _BraceScanner()
+            saw_response = False
+            complete = False
+            grace_lines = _DONE_GRACE_LINES
+            
+            for line in response:
+                if not line.strip():
+                    continue
+                response_data = _json_loads(line)
                 
                 # Handle Ollama error payloads explicitly
                 if "error" in response_data:
                     error_msg = response_data["error"]
                     return None, f"ollama_error:{error_msg}"
                 
-                # Extract response field
-                if "response" not in response_data:
-                    return None, "missing_response_field"
+                if "response" in response_data and not complete:
+                    saw_response = True
+                    piece = response_data["response"]
+                    pieces.append(piece)
+                    # Scan for the first valid object; a balanced span that
+                    # does not decode (e.g. "{goal}" in prose) is skipped
+                    end = scanner.feed(piece)
+                    while end is not None:
+                        text = "".join(pieces)
+                        try:
+                            _JSON_DECODER.raw_decode(text, scanner.start)
+                        except ValueError:
+                            end = scanner.restart(text)
+                        else:
+                            complete = True
+                            break
                 
-                return response_data["response"], None
-        
-        except urllib.error.URLError as e:
-            return None, f"connection_failed:{str(e)}"
-        except urllib.error.HTTPError as e:
-            return None, f"http_error:{e.code}"
-        except TimeoutError:
-            return None, "timeout"
-        except json.JSONDecodeError as e:
-            return None, f"response_parse_error:{str(e)}"
-        except Exception as e:
-            return None, f"unexpected_error:{str(e)}"
+                if response_data.get("done"):
+                    response.read()  # Drain the chunked-encoding trailer
+                    keep_alive = not response.will_close
+                    break
+                
+                if complete:
+                    # Object complete: later output is ignored. Wait a few
+                    # lines for "done" so the connection can be kept; if the
+                    # model keeps generating, closing it (see finally)
+                    # stops generation.
+                    if grace_lines == 0:
+                        break
+                    grace_lines -= 1
+            
+            # Extract response field
+            if not saw_response:
+                return None, "missing_response_field"
+            
+            return "".join(pieces), None
+        finally:
+            if not keep_alive:
+                self.close()
     
     def _extract_json(self, text: str) -> Optional[Dict[str, Any]]:
         """Extract JSON dict from text using robust strategies.
         
         Strategies (in order):
         a) Check for JSON inside ```json ... ``` code fences
-        b) Balanced-brace scan (string-safe)
-        c) Regex patterns as last resort
+        b) Decode from each '{' in turn; the first that starts a complete
+           object wins (braces inside strings are handled by the decoder)
         
-        Safety rule: Only return dict if json.loads() succeeds.
+        Safety rule: Only return dict if JSON parsing succeeds.
         
         Args:
             text: Text potentially containing JSON
@@ -201,88 +601,23 @@ class OllamaVLMClient:
             return None
         
         # Strategy a: Check for code fences
-        code_fence_pattern = r"```json\s*\n(.*?)\n```"
-        match = re.search(code_fence_pattern, text, re.DOTALL)
+        match = _CODE_FENCE_RE.search(text)
         if match:
             json_text = match.group(1).strip()
             try:
-                return json.loads(json_text)
+                return _json_loads(json_text)
             except json.JSONDecodeError:
-                pass  # Fall through to other strategies
-        
-        # Strategy b: Balanced-brace scan (string-safe)
-        result = self._extract_json_balanced_braces(text)
-        if result is not None:
-            return result
-        
-        # Strategy c: Regex patterns as last resort
-        # Try to find JSON-like pattern
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.finditer(json_pattern, text)
-        for match in matches:
-            json_text = match.group(0)
-            try:
-                result = json.loads(json_text)
-                if isinstance(result, dict):
-                    return result
-            except json.JSONDecodeError:
-                continue
-        
-        return None
-    
-    def _extract_json_balanced_braces(self, text: str) -> Optional[Dict[str, Any]]:
-        """Extract first complete JSON object using balanced-brace scan.
-        
-        String-safe: tracks in_string and escape to handle braces inside strings.
-        
-        Args:
-            text: Text containing JSON
+                pass  # Fall through to the scan
         
-        Returns:
-            Parsed dict if successful, None otherwise
-        """
-        # Find first opening brace
-        start_idx = text.find('{')
-        if start_idx == -1:
-            return None
-        
-        # Scan forward with string-safe brace counting
-        brace_count = 0
-        in_string = False
-        escape = False
-        
-        for i in range(start_idx, len(text)):
-            char = text[i]
-            
-            if escape:
-                escape = False
-                continue
-            
-            if char == '\\':
-                escape = True
-                continue
-            
-            if char == '"':
-                in_string = not in_string
-                continue
-            
-            # Only count braces when not in string
-            if not in_string:
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    
-                    if brace_count == 0:
-                        # Found matching closing brace
-                        json_text = text[start_idx:i+1]
-                        try:
-                            result = json.loads(json_text)
-                            if isinstance(result, dict):
-                                return result
-                        except json.JSONDecodeError:
-                            pass
-                        break
+        # Strategy b: raw_decode parses one value and stops at its end, so
+        # trailing prose or further objects are ignored
+        raw_decode = _JSON_DECODER.raw_decode
+        start = text.find('{')
+        while start != -1:
+            try:
+                return raw_decode(text, start)[0]
+            except ValueError:
+                start = text.find('{', start + 1)
         
         return None
     
@@ -304,41 +639,20 @@ class OllamaVLMClient:
         # Format constraints
         constraints_str = ", ".join(active_constraints) if active_constraints else "none"
         
-        # Format memory nodes
-        memory_str = ""
-        for node_ctx in memory_context:
-            node_id = node_ctx.get("node_id", "?")
-            score = node_ctx.get("score", 0.0)
-            tags = node_ctx.get("tags", [])
-            summary = node_ctx.get("summary", "")
-            tags_str = ", ".join(tags) if tags else "none"
-            memory_str += f"  - node_id={node_id}, score={score:.2f}, tags=[{tags_str}], summary=\"{summary}\"\n"
-        
+        # Format memory nodes (joined once rather than grown line by line)
+        memory_str = "".join(map(_format_memory_line, memory_context))
         if not memory_str:
             memory_str = "  (no memory nodes available)\n"
         
-        prompt = f"""You are a navigation assistant. Output ONLY valid JSON, no other text.
-
-Required schema:
-- target_status: one of ["visible", "not_visible", "ambiguous"] (OUTPUT field - different from belief status)
-- action: one of ["approach", "explore", "rotate", "goto_node", "ask_clarification", "stop"]
-- confidence: number in [0.0, 1.0]
-- rationale: string (max 240 chars)
-
-Conditional requirements:
-- If action="goto_node": must include navigation_goal with type="node_id" and node_id (integer)
-- If action="approach": must include navigation_goal with type="pose_relative", distance_meters, angle_degrees, standoff_distance
-- If action="ask_clarification": must include clarification_question (string, max 160 chars)
-
-Current context:
-- Goal: {goal_text}
-- Constraints: {constraints_str}
-- Belief status: {belief_target_status} (for reference only - OUTPUT target_status must be ONLY one of ["visible","not_visible","ambiguous"])
-- Candidate memory nodes (top 3):
-{memory_str}
-Output your hypothesis as JSON:"""
-        
-        return prompt
+        return (
+            f"{_PROMPT_HEADER}"
+            f"- Goal: {goal_text}\n"
+            f"- Constraints: {constraints_str}\n"
+            f"- Belief status: {belief_target_status} {_BELIEF_STATUS_NOTE}\n"
+            f"- Candidate memory nodes (top 3):\n"
+            f"{memory_str}\n"
+            f"Output your hypothesis as JSON:"
+        )
     
     def _build_repair_prompt(self) -> str:
         """Build repair prompt for retry after invalid output.
@@ -346,18 +660,5 @@ Output your hypothesis as JSON:"""
         Returns:
             Repair prompt string
         """
-        return """You returned invalid JSON. Output ONLY valid JSON with no extra text.
-
-Required schema:
-- target_status: one of ["visible", "not_visible", "ambiguous"]
-- action: one of ["approach", "explore", "rotate", "goto_node", "ask_clarification", "stop"]
-- confidence: number in [0.0, 1.0]
-- rationale: string (max 240 chars)
-
-Conditional requirements:
-- If action="goto_node": must include navigation_goal with type="node_id" and node_id (integer)
-- If action="approach": must include navigation_goal with type="pose_relative", distance_meters, angle_degrees, standoff_distance
-- If action="ask_clarification": must include clarification_question (string, max 160 chars)
-
-Output valid JSON now:"""
+        return _REPAIR_PROMPT
 